@@ -0,0 +1,420 @@
+# bench.py
+# 모집 회차 하나를 흉내 내는 부하 테스트
+#
+# - 응시자 N명: register → save_draft 여러 번(첫 번째는 전체, 이후는 부분 저장) → submit → result 폴링
+# - 관리자 1명: list / get / update_status 반복 (상태 변경은 벤치가 등록한 지원자에게만)
+# - 엔드포인트별 처리량, p50/p95/p99 지연, 상태 코드,
+#   잠금(503 busy) 재시도 / 요청 제한(429) / 서버 오류(5xx) 횟수를 따로 출력
+# - 부하가 끝난 뒤 목록 응답 형식(rows / columnar) 비교: 응답 크기(원본/gzip), 지연
+#
+# 사용 예)
+#   python bench.py                              # Flask test client + 임시 DB (서버 따로 안 띄움)
+#   python bench.py --users 200 --saves 20 --body-size 6000
+#   python bench.py --target http://127.0.0.1:8000 --admin-password ...   # 실행 중인 gunicorn 대상
+#   python bench.py --out bench_output.txt       # 결과를 파일 끝에 덧붙여 커밋 간 비교
+import argparse
+import gzip
+import http.cookiejar
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from datetime import datetime
+
+HANGUL = "가나다라마바사아자차카타파하거너더러머버서어저처커터퍼허고노도로모보소오조초"
+
+# 거절된 응답은 잠시 후 다시 시도하고, 원인별로 횟수를 따로 센다
+# - lock : 503 busy (쓰기 잠금을 못 얻었거나 묶음 쓰기 대기 시간 초과)
+# - 429  : 요청 제한 / 동시 처리 상한 (잠금과 무관)
+# - 5xx  : 그 밖의 서버 오류
+RETRY_KINDS = ("lock", "429", "5xx")
+MAX_RETRIES = 5
+
+
+def retry_kind(status, data):
+    reason = data.get("reason") if isinstance(data, dict) else None
+    if status == 503 and reason == "busy":
+        return "lock"
+    if status == 429:
+        return "429"
+    if status >= 500:
+        return "5xx"
+    return None
+
+
+def utf16_len(text):
+    # 서버 부분 저장은 브라우저 JS 와 같은 UTF-16 길이를 기준으로 함
+    return len(text.encode("utf-16-le")) // 2
+
+
+def make_text(rng, size):
+    words = []
+    total = 0
+    while total < size:
+        word = "".join(rng.choice(HANGUL) for _ in range(rng.randint(2, 6)))
+        words.append(word)
+        total += len(word) + 1
+    return " ".join(words)[:size]
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, int(round(p / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[k]
+
+
+# ─────────────────────────
+# 클라이언트 (test client / HTTP 공통 인터페이스)
+# ─────────────────────────
+class TestClientSession:
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, body=None, headers=None):
+        resp = self.client.open(path, method=method, json=body, headers=headers or {})
+        data = resp.get_json(silent=True)
+        return resp.status_code, data, dict(resp.headers)
+
+    def get_raw(self, path):
+        resp = self.client.get(path)
+        return resp.status_code, resp.get_data()
+
+
+class HttpSession:
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip("/")
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar())
+        )
+
+    def request(self, method, path, body=None, headers=None):
+        data = None
+        headers = dict(headers or {})
+        if body is not None:
+            data = json.dumps(body).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        req = urllib.request.Request(self.base_url + path, data=data, method=method, headers=headers)
+        try:
+            with self.opener.open(req, timeout=60) as resp:
+                status, raw, resp_headers = resp.status, resp.read(), dict(resp.headers)
+        except urllib.error.HTTPError as e:
+            status, raw, resp_headers = e.code, e.read(), dict(e.headers)
+        try:
+            payload = json.loads(raw) if raw else None
+        except ValueError:
+            payload = None
+        return status, payload, resp_headers
+
+    def get_raw(self, path):
+        req = urllib.request.Request(self.base_url + path)
+        try:
+            with self.opener.open(req, timeout=60) as resp:
+                return resp.status, resp.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+
+
+# ─────────────────────────
+# 측정
+# ─────────────────────────
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)  # 엔드포인트 → [ms]
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.retries = {kind: defaultdict(int) for kind in RETRY_KINDS}  # 원인 → 엔드포인트 → 횟수
+        self.server_lock_errors = 0
+        self.created_ids = set()  # 벤치가 등록한 testId (관리자 상태 변경 대상)
+
+    def call(self, session, name, method, path, body=None, headers=None):
+        """요청 1건 (잠금/요청 제한/서버 오류로 거절되면 지수 백오프로 재시도)"""
+        for attempt in range(MAX_RETRIES + 1):
+            started = time.perf_counter()
+            status, data, resp_headers = session.request(method, path, body, headers)
+            elapsed = (time.perf_counter() - started) * 1000
+            with self.lock:
+                self.latencies[name].append(elapsed)
+                self.statuses[name][status] += 1
+            kind = retry_kind(status, data)
+            if kind is None or attempt == MAX_RETRIES:
+                return status, data, resp_headers
+            with self.lock:
+                self.retries[kind][name] += 1
+            time.sleep(min(2.0, 0.05 * (2 ** attempt)) * random.uniform(0.5, 1.5))
+        return status, data, resp_headers
+
+
+# ─────────────────────────
+# 시나리오
+# ─────────────────────────
+def applicant(rec, session, idx, args, rng):
+    status, data, _ = rec.call(
+        session, "register", "POST", "/api/writer-test/register",
+        {"name": f"bench{idx}", "birthYear": "1990", "phoneLast4": f"{idx % 10000:04d}"},
+    )
+    if status != 200 or not data or not data.get("ok"):
+        return
+    test_id = data["testId"]
+    with rec.lock:
+        rec.created_ids.add(test_id)
+
+    body = ""
+    rev = None
+    chunk = max(1, args.body_size // max(1, args.saves))
+    for i in range(args.saves):
+        addition = make_text(rng, chunk) + "\n"
+        if rev is None:
+            payload = {"testId": test_id, "title": f"bench {idx}", "body": body + addition}
+        else:
+            # 브라우저처럼 끝에 덧붙인 부분만 보냄
+            pos = utf16_len(body)
+            payload = {
+                "testId": test_id,
+                "title": f"bench {idx}",
+                "baseRev": rev,
+                "edits": [{"start": pos, "end": pos, "text": addition}],
+                "bodyLength": pos + utf16_len(addition),
+            }
+        status, data, _ = rec.call(session, "save_draft", "POST", "/api/writer-test/save_draft", payload)
+        if status == 200 and data and data.get("ok"):
+            body += addition
+            rev = data.get("rev")
+        else:
+            rev = None  # 다음 저장은 전체 저장으로
+        if args.think_ms:
+            time.sleep(rng.uniform(0, args.think_ms) / 1000)
+
+    # 제출 최소 글자 수(공백 제외 2000자)를 넘기도록 보충
+    while len(body.replace(" ", "").replace("\n", "")) < 2100:
+        body += make_text(rng, 500)
+    rec.call(
+        session, "submit", "POST", "/api/writer-test/submit",
+        {"testId": test_id, "title": f"bench {idx}", "body": body},
+    )
+
+    etag = None
+    for _ in range(args.result_polls):
+        headers = {"If-None-Match": etag} if etag else None
+        _, _, resp_headers = rec.call(
+            session, "result", "GET", f"/api/writer-test/result?testId={test_id}", headers=headers
+        )
+        etag = resp_headers.get("ETag") or etag
+        if args.think_ms:
+            time.sleep(rng.uniform(0, args.think_ms) / 1000)
+
+
+def admin(rec, session, args, rng, stop):
+    status, _, _ = session.request(
+        "POST", "/api/admin/login", {"password": args.admin_password}
+    )
+    if status != 200:
+        print("관리자 로그인 실패 (--admin-password 확인)", file=sys.stderr)
+        return
+    statuses = ("pending", "pass", "fail", "return")
+    iterations = 0
+    while True:
+        status, data, _ = rec.call(session, "list", "GET", "/api/writer-test/list?limit=50")
+        tests = (data or {}).get("tests") or []
+        if tests:
+            target = rng.choice(tests)["id"]
+            rec.call(session, "get", "GET", f"/api/writer-test/get?id={target}")
+            # 실서버(--target)의 실제 지원자 상태를 바꾸지 않도록 벤치가 등록한 지원자만 변경
+            with rec.lock:
+                own = [t["id"] for t in tests if t["id"] in rec.created_ids]
+            if own:
+                rec.call(
+                    session, "update_status", "POST", "/api/writer-test/update_status",
+                    {"id": rng.choice(own), "status": rng.choice(statuses)},
+                )
+        iterations += 1
+        if stop.is_set() and iterations >= args.admin_iters:
+            break
+        time.sleep(0.05)
+
+
+def compare_list_formats(session, args):
+    """같은 목록을 rows / columnar 로 번갈아 요청 → 응답 크기(원본/gzip)와 지연 비교"""
+    status, _, _ = session.request(
+        "POST", "/api/admin/login", {"password": args.admin_password}
+    )
+    if status != 200:
+        return []
+    if not args.target:
+        # 임시 DB 의 블랙리스트는 비어 있음 → 비교용으로 채움 (실서버 대상일 땐 건드리지 않음)
+        for i in range(200):
+            session.request(
+                "POST", "/api/writer-test/blacklist_add",
+                {"name": f"블랙{i}", "birthYear": "1990", "phoneLast4": f"{i:04d}", "reason": "bench"},
+            )
+    lines = [
+        f"{'list format':<34}{'bytes':>9}{'gzip':>8}{'p50':>9}{'p95':>9}",
+    ]
+    for base in ("/api/writer-test/list?limit=200", "/api/writer-test/blacklist"):
+        sep = "&" if "?" in base else "?"
+        results = {}
+        for _ in range(args.format_iters):
+            for fmt in ("rows", "columnar"):
+                started = time.perf_counter()
+                status, raw = session.get_raw(f"{base}{sep}format={fmt}")
+                elapsed = (time.perf_counter() - started) * 1000
+                if status != 200:
+                    continue
+                entry = results.setdefault(fmt, {"raw": raw, "ms": []})
+                entry["ms"].append(elapsed)
+        for fmt, entry in results.items():
+            values = sorted(entry["ms"])
+            label = base.split("?")[0].rsplit("/", 1)[-1] + f" ({fmt})"
+            lines.append(
+                f"{label:<34}{len(entry['raw']):>9}{len(gzip.compress(entry['raw'])):>8}"
+                f"{percentile(values, 50):>9.2f}{percentile(values, 95):>9.2f}"
+            )
+    return lines
+
+
+# ─────────────────────────
+# 실행 / 보고
+# ─────────────────────────
+def make_session_factory(args):
+    if args.target:
+        return (lambda: HttpSession(args.target)), None
+
+    # 서버를 import 하기 전에 임시 DB 로 돌려놓음 (writer_test.db 를 건드리지 않도록)
+    os.environ["DB_PATH"] = os.path.join(tempfile.mkdtemp(prefix="bench-"), "bench.db")
+    if not args.keep_rate_limit:
+        os.environ.setdefault("WRITE_RATE_LIMIT", "0")
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import server
+    from flask import got_request_exception
+
+    args.admin_password = args.admin_password or server.ADMIN_PASSWORD
+    return (lambda: TestClientSession(server.app)), got_request_exception
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL,
+            text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def report(rec, args, elapsed, format_lines=()):
+    lines = []
+    total = sum(len(v) for v in rec.latencies.values())
+    lines.append(
+        f"===== bench {datetime.now():%Y-%m-%d %H:%M:%S} rev={git_revision()} "
+        f"target={args.target or 'test-client'} ====="
+    )
+    lines.append(
+        f"users={args.users} saves={args.saves} body={args.body_size} "
+        f"polls={args.result_polls} concurrency={args.concurrency}"
+    )
+    lines.append(f"총 {total}건 / {elapsed:.2f}초 = {total / elapsed:.1f} req/s")
+    lines.append(
+        f"{'endpoint':<14}{'count':>7}{'req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"
+        f"{'lock':>6}{'429':>6}{'5xx':>6}  status"
+    )
+    for name in ("register", "save_draft", "submit", "result", "list", "get", "update_status"):
+        values = sorted(rec.latencies.get(name, []))
+        if not values:
+            continue
+        codes = " ".join(f"{code}:{n}" for code, n in sorted(rec.statuses[name].items()))
+        lines.append(
+            f"{name:<14}{len(values):>7}{len(values) / elapsed:>9.1f}"
+            f"{percentile(values, 50):>9.1f}{percentile(values, 95):>9.1f}"
+            f"{percentile(values, 99):>9.1f}{values[-1]:>9.1f}"
+            + "".join(f"{rec.retries[kind].get(name, 0):>6}" for kind in RETRY_KINDS)
+            + f"  {codes}"
+        )
+    totals = {kind: sum(rec.retries[kind].values()) for kind in RETRY_KINDS}
+    lines.append(
+        f"재시도: 잠금(503 busy) {totals['lock']}회, 요청 제한(429) {totals['429']}회, "
+        f"서버 오류(5xx) {totals['5xx']}회"
+        + ("" if args.target else f" / 서버 내부 database is locked 예외 {rec.server_lock_errors}회")
+    )
+    lines.extend(format_lines)
+    lines.append("(지연 단위: ms)")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="신규작가 TEST 서버 부하 테스트")
+    parser.add_argument("--users", type=int, default=50, help="가상 응시자 수")
+    parser.add_argument("--concurrency", type=int, default=25, help="동시에 진행하는 응시자 수")
+    parser.add_argument("--saves", type=int, default=10, help="응시자당 임시저장 횟수")
+    parser.add_argument("--body-size", type=int, default=4000, help="최종 본문 글자 수")
+    parser.add_argument("--result-polls", type=int, default=5, help="제출 후 결과 조회 횟수")
+    parser.add_argument("--admin-iters", type=int, default=20, help="관리자 반복 최소 횟수")
+    parser.add_argument("--think-ms", type=float, default=0, help="요청 사이 임의 대기 상한(ms)")
+    parser.add_argument("--target", help="실행 중인 서버 주소 (없으면 Flask test client)")
+    parser.add_argument("--admin-password", default=os.environ.get("ADMIN_PASSWORD"))
+    parser.add_argument("--keep-rate-limit", action="store_true", help="test client 모드에서도 요청 제한 유지")
+    parser.add_argument("--format-iters", type=int, default=20, help="목록 형식 비교 반복 횟수 (0 이면 생략)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", help="결과를 덧붙일 파일 (예: bench_output.txt)")
+    args = parser.parse_args()
+
+    session_factory, exception_signal = make_session_factory(args)
+    rec = Recorder()
+
+    if exception_signal is not None:
+        def count_lock_error(sender, exception, **extra):
+            if "locked" in str(exception):
+                with rec.lock:
+                    rec.server_lock_errors += 1
+        exception_signal.connect(count_lock_error, weak=False)
+
+    # 응시자 번호를 나눠 갖는 스레드 풀
+    next_user = iter(range(args.users))
+    next_lock = threading.Lock()
+
+    def applicant_worker(worker_no):
+        rng = random.Random(args.seed * 1000 + worker_no)
+        session = session_factory()
+        while True:
+            with next_lock:
+                idx = next(next_user, None)
+            if idx is None:
+                return
+            applicant(rec, session, idx, args, rng)
+
+    stop = threading.Event()
+    started = time.perf_counter()
+    admin_thread = threading.Thread(
+        target=admin, args=(rec, session_factory(), args, random.Random(args.seed), stop)
+    )
+    admin_thread.start()
+    workers = [
+        threading.Thread(target=applicant_worker, args=(i,))
+        for i in range(max(1, min(args.concurrency, args.users)))
+    ]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    stop.set()
+    admin_thread.join()
+    elapsed = time.perf_counter() - started
+
+    format_lines = compare_list_formats(session_factory(), args) if args.format_iters > 0 else []
+    text = report(rec, args, elapsed, format_lines)
+    print(text)
+    if args.out:
+        with open(args.out, "a", encoding="utf-8") as f:
+            f.write(text + "\n\n")
+
+
+if __name__ == "__main__":
+    main()
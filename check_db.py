@@ -1,23 +1,385 @@
 # check_db.py
+# 운영용 DB 점검 도구 (서버가 돌고 있는 중에도 실행 가능)
+#
+# - recent    : 최근 제출된 TEST 몇 건 확인 (예전 check_db.py 동작, 명령 없이 실행하면 이것)
+# - backup    : sqlite3 backup API 로 온라인 백업 (작은 페이지 단위로 나눠 복사 → 쓰기를 오래 막지 않음)
+# - integrity : PRAGMA integrity_check / quick_check
+# - optimize  : PRAGMA optimize (또는 ANALYZE 전체), 전문 검색 색인 정리
+# - vacuum    : 빈 페이지를 incremental_vacuum 으로 조금씩 파일에서 돌려줌
+# - stats     : 파일/페이지 크기, 테이블·인덱스별 크기와 행 수
+#
+# 사용 예)
+#   python check_db.py                                  # 최근 5건
+#   DB_PATH=/var/data/writer_test.db python check_db.py backup --keep 14 --verify
+#   python check_db.py integrity --quick
+#   python check_db.py vacuum --pages 200
+#   python check_db.py stats
+#
+# - DB_PATH 는 서버와 같은 환경변수 (없으면 writer_test.db)
+# - 서버는 WAL 모드라서 읽기(backup/integrity/stats)는 응시자 저장을 막지 않는다.
+#   쓰기가 필요한 optimize / vacuum 은 짧은 트랜잭션으로 나눠서 busy_timeout 안에서 기다린다.
+import argparse
+import glob
+import os
 import sqlite3
+import sys
+import time
+import zlib
+from datetime import datetime
 
-DB_PATH = "writer_test.db"
+DB_PATH = os.environ.get("DB_PATH", "writer_test.db")
+DB_BUSY_TIMEOUT_MS = int(os.environ.get("DB_BUSY_TIMEOUT_MS", "5000"))
 
-conn = sqlite3.connect(DB_PATH)
-cur = conn.cursor()
 
-# 최근 5개만 확인
-cur.execute("""
-    SELECT id, name, birth_year, phone_last4, title, char_count, status, submitted_at
-    FROM writer_tests
-    ORDER BY id DESC
-    LIMIT 5
-""")
+class BackupRestarted(Exception):
+    pass
 
-rows = cur.fetchall()
 
-print("===== 최근 제출된 TEST 5건 =====")
-for row in rows:
-    print(row)
+def unpack_body(blob):
+    # server.py 와 같음: 전문 검색 뷰(writer_tests_search)가 본문 압축을 풀 때 사용
+    if blob is None:
+        return ""
+    if isinstance(blob, str):
+        return blob
+    return zlib.decompress(blob).decode("utf-8")
 
-conn.close()
+
+def connect(path=DB_PATH, readonly=False):
+    if not os.path.exists(path):
+        sys.exit(f"DB 파일이 없습니다: {path}")
+    conn = sqlite3.connect(path, timeout=DB_BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+    conn.execute(f"PRAGMA busy_timeout={DB_BUSY_TIMEOUT_MS}")
+    conn.create_function("unpack_body", 1, unpack_body, deterministic=True)
+    if readonly:
+        conn.execute("PRAGMA query_only=1")
+    return conn
+
+
+def human_size(n):
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024 or unit == "GB":
+            return f"{n:.0f}{unit}" if unit == "B" else f"{n:.1f}{unit}"
+        n /= 1024
+
+
+# ─────────────────────────
+# recent: 최근 제출 확인
+# ─────────────────────────
+def cmd_recent(args):
+    conn = connect(readonly=True)
+    rows = conn.execute(
+        """
+        SELECT id, name, birth_year, phone_last4, title, char_count, status, submitted_at
+        FROM writer_tests
+        ORDER BY id DESC
+        LIMIT ?
+        """,
+        (args.limit,),
+    ).fetchall()
+
+    print(f"===== 최근 제출된 TEST {args.limit}건 =====")
+    for row in rows:
+        print(row)
+    conn.close()
+    return 0
+
+
+# ─────────────────────────
+# backup: 온라인 백업
+# ─────────────────────────
+# - step_pages 페이지씩 복사하고 sleep 만큼 쉬면서 진행 → 그 사이 서버 쓰기가 끼어들 수 있음
+# - 복사 도중 다른 연결이 DB 를 바꾸면 SQLite 가 처음부터 다시 복사한다.
+#   마감 직전처럼 쓰기가 계속되면 끝나지 않을 수 있어서 max_restarts 번 넘게 다시 시작되면
+#   한 번에 복사(pages=-1)로 전환. WAL 모드라 이때도 읽기 트랜잭션 하나만 잡으므로 쓰기는 막지 않는다.
+# - <dest>.part 에 만든 뒤 이름을 바꾸므로 중간에 끊겨도 깨진 백업 파일이 남지 않음
+def default_backup_dir():
+    return os.path.join(os.path.dirname(os.path.abspath(DB_PATH)), "backups")
+
+
+def run_backup(src, dest, step_pages, sleep_seconds, max_restarts):
+    state = {"restarts": 0, "last_remaining": None, "steps": 0}
+
+    def progress(status, remaining, total):
+        state["steps"] += 1
+        if state["last_remaining"] is not None and remaining > state["last_remaining"]:
+            state["restarts"] += 1
+            if state["restarts"] > max_restarts:
+                raise BackupRestarted()
+        state["last_remaining"] = remaining
+        if remaining:
+            # backup() 의 sleep 인자는 BUSY 일 때만 쉬므로 단계 사이 쉬는 건 여기서
+            time.sleep(sleep_seconds)
+
+    part = dest + ".part"
+    for mode in ("step", "once"):
+        if os.path.exists(part):
+            os.remove(part)
+        dst = sqlite3.connect(part)
+        try:
+            if mode == "step":
+                src.backup(dst, pages=step_pages, progress=progress)
+            else:
+                src.backup(dst, pages=-1)
+            break
+        except BackupRestarted:
+            print(
+                f"쓰기가 계속되어 백업이 {state['restarts']}번 다시 시작됨 → 한 번에 복사로 전환",
+                file=sys.stderr,
+            )
+        finally:
+            dst.close()
+    os.replace(part, dest)
+    return state
+
+
+def cmd_backup(args):
+    dest = args.dest
+    if not dest:
+        os.makedirs(args.dir, exist_ok=True)
+        base = os.path.splitext(os.path.basename(DB_PATH))[0]
+        dest = os.path.join(args.dir, f"{base}-{datetime.now():%Y%m%d-%H%M%S}.db")
+
+    src = connect(readonly=True)
+    started = time.perf_counter()
+    state = run_backup(src, dest, args.step_pages, args.sleep_ms / 1000, args.max_restarts)
+    src.close()
+    elapsed = time.perf_counter() - started
+    print(
+        f"백업 완료: {dest} ({human_size(os.path.getsize(dest))}, {elapsed:.1f}초, "
+        f"{state['steps']}단계, 재시작 {state['restarts']}번)"
+    )
+
+    ok = True
+    if args.verify:
+        conn = connect(dest, readonly=True)
+        result = conn.execute("PRAGMA quick_check").fetchone()[0]
+        conn.close()
+        ok = result == "ok"
+        print(f"백업 파일 quick_check: {result}")
+
+    if args.keep and not args.dest:
+        # 같은 DB 이름으로 만든 백업만 오래된 것부터 정리
+        base = os.path.splitext(os.path.basename(DB_PATH))[0]
+        backups = sorted(glob.glob(os.path.join(args.dir, f"{base}-*.db")))
+        for old in backups[: max(0, len(backups) - args.keep)]:
+            os.remove(old)
+            print(f"오래된 백업 삭제: {old}")
+    return 0 if ok else 1
+
+
+# ─────────────────────────
+# integrity: 무결성 검사
+# ─────────────────────────
+def cmd_integrity(args):
+    conn = connect(readonly=True)
+    pragma = "quick_check" if args.quick else "integrity_check"
+    started = time.perf_counter()
+    results = [r[0] for r in conn.execute(f"PRAGMA {pragma}({args.max_errors})")]
+    fk_errors = conn.execute("PRAGMA foreign_key_check").fetchall()
+    conn.close()
+
+    ok = results == ["ok"] and not fk_errors
+    print(f"{pragma}: {'ok' if ok else '문제 발견'} ({time.perf_counter() - started:.1f}초)")
+    if results != ["ok"]:
+        for line in results:
+            print("  " + line)
+    for row in fk_errors:
+        print(f"  foreign key: {tuple(row)}")
+    return 0 if ok else 1
+
+
+# ─────────────────────────
+# optimize: 통계 갱신
+# ─────────────────────────
+# - 기본: PRAGMA optimize (필요한 테이블만, analysis_limit 으로 표본 크기 제한 → 짧게 끝남)
+# - --full: ANALYZE 전체 (행 수가 크게 바뀐 직후, 예: 회차 마감 뒤)
+# - --fts: 전문 검색 색인 조각 합치기 (쓰기 잠금을 잡으므로 한가한 시간에)
+# - --fts-rebuild: 색인을 본문에서 다시 만듦. 서버 밖(sqlite3 CLI 등)에서 writer_tests / 본문을
+#   고친 뒤에는 색인이 어긋나므로 한 번 실행 (전체를 다시 읽으므로 TEST 가 닫혀 있을 때)
+def cmd_optimize(args):
+    conn = connect()
+    started = time.perf_counter()
+    if args.full:
+        conn.execute("ANALYZE")
+        print("ANALYZE 완료")
+    else:
+        conn.execute(f"PRAGMA analysis_limit={args.analysis_limit}")
+        conn.execute("PRAGMA optimize")
+        print("PRAGMA optimize 완료")
+
+    if args.fts or args.fts_rebuild:
+        has_fts = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name='writer_tests_fts'"
+        ).fetchone()
+        if not has_fts:
+            print("전문 검색 색인 없음 (건너뜀)")
+        elif args.fts_rebuild:
+            conn.execute("INSERT INTO writer_tests_fts(writer_tests_fts) VALUES('rebuild')")
+            print("전문 검색 색인 rebuild 완료")
+        else:
+            conn.execute("INSERT INTO writer_tests_fts(writer_tests_fts) VALUES('optimize')")
+            print("전문 검색 색인 optimize 완료")
+    conn.close()
+    print(f"({time.perf_counter() - started:.1f}초)")
+    return 0
+
+
+# ─────────────────────────
+# vacuum: 빈 페이지 반환
+# ─────────────────────────
+# - auto_vacuum=INCREMENTAL 인 DB 에서 incremental_vacuum(pages) 를 짧은 트랜잭션으로 반복
+#   → 한 번에 잠그는 시간이 짧아서 서버가 도는 중에도 실행 가능
+# - 예전에 만든 DB 는 auto_vacuum=NONE. --enable 로 한 번 VACUUM 해서 바꿔야 함
+#   (DB 전체를 다시 쓰는 동안 쓰기가 막히므로 TEST 가 닫혀 있을 때만)
+def cmd_vacuum(args):
+    conn = connect()
+    mode = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+    if mode != 2:
+        if not args.enable:
+            print(
+                "auto_vacuum 이 INCREMENTAL 이 아닙니다 (현재 "
+                f"{['NONE', 'FULL', 'INCREMENTAL'][mode]}).\n"
+                "TEST 가 닫혀 있을 때 'python check_db.py vacuum --enable' 로 한 번 전환하세요."
+            )
+            conn.close()
+            return 1
+        started = time.perf_counter()
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute("VACUUM")
+        print(f"auto_vacuum=INCREMENTAL 전환 + VACUUM 완료 ({time.perf_counter() - started:.1f}초)")
+
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    free_before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    freed = 0
+    started = time.perf_counter()
+    while True:
+        free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        if free == 0 or (args.max_pages and freed >= args.max_pages):
+            break
+        step = min(args.pages, free)
+        if args.max_pages:
+            step = min(step, args.max_pages - freed)
+        # 자동 커밋 모드: 한 번의 incremental_vacuum 이 한 트랜잭션
+        # (execute 는 문을 한 단계만 실행해서 1페이지만 반환됨 → executescript 로 끝까지)
+        conn.executescript(f"PRAGMA incremental_vacuum({step});")
+        freed += free - conn.execute("PRAGMA freelist_count").fetchone()[0]
+        time.sleep(args.sleep_ms / 1000)
+
+    # WAL 에 쌓인 변경을 DB 파일로 (다른 연결을 기다리지 않는 PASSIVE)
+    conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchall()
+    conn.close()
+    print(
+        f"빈 페이지 {free_before} → {free_before - freed} "
+        f"({human_size(freed * page_size)} 반환, {time.perf_counter() - started:.1f}초)"
+    )
+    return 0
+
+
+# ─────────────────────────
+# stats: 크기 / 페이지 통계
+# ─────────────────────────
+def cmd_stats(args):
+    conn = connect(readonly=True)
+
+    def pragma(name):
+        return conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+    page_size = pragma("page_size")
+    page_count = pragma("page_count")
+    freelist = pragma("freelist_count")
+    wal_path = DB_PATH + "-wal"
+    print(f"DB 파일        : {DB_PATH} ({human_size(os.path.getsize(DB_PATH))})")
+    if os.path.exists(wal_path):
+        print(f"WAL 파일       : {human_size(os.path.getsize(wal_path))}")
+    print(f"journal_mode   : {pragma('journal_mode')}")
+    print(f"auto_vacuum    : {['NONE', 'FULL', 'INCREMENTAL'][pragma('auto_vacuum')]}")
+    print(f"user_version   : {pragma('user_version')}")
+    print(f"page_size      : {page_size}")
+    print(f"page_count     : {page_count} ({human_size(page_count * page_size)})")
+    print(f"freelist_count : {freelist} ({human_size(freelist * page_size)})")
+
+    objects = conn.execute(
+        """
+        SELECT name, type, tbl_name FROM sqlite_master
+        WHERE type IN ('table', 'index') AND name NOT LIKE 'sqlite_autoindex%'
+        ORDER BY name
+        """
+    ).fetchall()
+
+    # dbstat 가상 테이블이 있으면 객체별 페이지 수/크기까지 (SQLITE_ENABLE_DBSTAT_VTAB)
+    sizes = {}
+    try:
+        for name, pages, size in conn.execute(
+            "SELECT name, COUNT(*), SUM(pgsize) FROM dbstat GROUP BY name"
+        ):
+            sizes[name] = (pages, size)
+    except sqlite3.OperationalError:
+        print("(dbstat 을 쓸 수 없는 SQLite 빌드: 행 수만 표시)")
+
+    print()
+    print(f"{'name':<36}{'type':<7}{'rows':>10}{'pages':>9}{'size':>10}")
+    for name, kind, _ in objects:
+        rows = ""
+        if kind == "table":
+            try:
+                rows = conn.execute(f'SELECT COUNT(*) FROM "{name}"').fetchone()[0]
+            except sqlite3.OperationalError:
+                rows = "-"  # 가상 테이블 등
+        pages, size = sizes.get(name, ("", None))
+        print(
+            f"{name:<36}{kind:<7}{rows:>10}{pages:>9}"
+            f"{human_size(size) if size is not None else '':>10}"
+        )
+    conn.close()
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="신규작가 TEST DB 점검/백업 도구")
+    sub = parser.add_subparsers(dest="command")
+
+    p = sub.add_parser("recent", help="최근 제출 확인")
+    p.add_argument("-n", "--limit", type=int, default=5)
+    p.set_defaults(func=cmd_recent)
+
+    p = sub.add_parser("backup", help="온라인 백업 (backup API, 페이지 단위)")
+    p.add_argument("--dest", help="백업 파일 경로 (없으면 --dir 에 날짜시각 이름으로)")
+    p.add_argument("--dir", default=default_backup_dir(), help="백업 폴더 (기본: DB 옆 backups/)")
+    p.add_argument("--step-pages", type=int, default=256, help="한 번에 복사할 페이지 수")
+    p.add_argument("--sleep-ms", type=float, default=20, help="단계 사이 쉬는 시간(ms)")
+    p.add_argument("--max-restarts", type=int, default=20, help="이만큼 다시 시작되면 한 번에 복사로 전환")
+    p.add_argument("--keep", type=int, default=0, help="--dir 에 남길 최근 백업 수 (0 이면 모두 유지)")
+    p.add_argument("--verify", action="store_true", help="백업 파일 quick_check")
+    p.set_defaults(func=cmd_backup)
+
+    p = sub.add_parser("integrity", help="무결성 검사")
+    p.add_argument("--quick", action="store_true", help="quick_check (인덱스 내용 비교 생략, 빠름)")
+    p.add_argument("--max-errors", type=int, default=100)
+    p.set_defaults(func=cmd_integrity)
+
+    p = sub.add_parser("optimize", help="PRAGMA optimize / ANALYZE")
+    p.add_argument("--full", action="store_true", help="ANALYZE 전체")
+    p.add_argument("--analysis-limit", type=int, default=400, help="PRAGMA optimize 표본 행 수")
+    p.add_argument("--fts", action="store_true", help="전문 검색 색인 optimize")
+    p.add_argument("--fts-rebuild", action="store_true", help="전문 검색 색인을 본문에서 다시 만듦")
+    p.set_defaults(func=cmd_optimize)
+
+    p = sub.add_parser("vacuum", help="빈 페이지 반환 (incremental_vacuum)")
+    p.add_argument("--pages", type=int, default=256, help="트랜잭션 하나에서 반환할 페이지 수")
+    p.add_argument("--max-pages", type=int, default=0, help="이번 실행에서 반환할 최대 페이지 수 (0: 전부)")
+    p.add_argument("--sleep-ms", type=float, default=50, help="단계 사이 쉬는 시간(ms)")
+    p.add_argument("--enable", action="store_true", help="auto_vacuum=INCREMENTAL 로 전환 (전체 VACUUM)")
+    p.set_defaults(func=cmd_vacuum)
+
+    p = sub.add_parser("stats", help="크기 / 페이지 통계")
+    p.set_defaults(func=cmd_stats)
+
+    args = parser.parse_args()
+    if args.command is None:
+        # 예전처럼 인자 없이 실행하면 최근 5건
+        args = parser.parse_args(["recent"])
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
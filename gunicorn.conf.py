@@ -0,0 +1,97 @@
+# gunicorn 설정 (gunicorn -c gunicorn.conf.py server:app, 작업 폴더에 있으면 자동으로 읽힘)
+#
+# 관리자 변경 내역 SSE 스트림(CHANGE_STREAM_ENABLED=1)은 연결 하나가 스레드 하나를
+# 계속 쓰므로, 스트림을 켤 때만 gthread worker 로 띄우고 스트림이 끊기기 전에
+# worker 가 timeout 으로 재시작되지 않도록 timeout 을 CHANGE_STREAM_MAX_SECONDS(300초)보다 길게 둠.
+# 스트림을 켜지 않으면 (기본) 관리자 화면은 /api/writer-test/changes?since= 폴링만 쓰므로
+# gunicorn 기본값(sync worker, 30초 timeout)을 그대로 써서 멈춘 worker 를 빨리 재시작함.
+import json
+import os
+import sys
+
+# Render 등은 PORT 를 지정해 줌 (gunicorn 기본 bind 와 같은 규칙)
+bind = os.environ.get("GUNICORN_BIND", f"0.0.0.0:{os.environ.get('PORT', '5000')}")
+workers = int(os.environ.get("GUNICORN_WORKERS", "2"))
+
+if os.environ.get("CHANGE_STREAM_ENABLED", "0") == "1":
+    worker_class = "gthread"
+    threads = int(os.environ.get("GUNICORN_THREADS", "16"))
+    timeout = int(os.environ.get("GUNICORN_TIMEOUT", "330"))
+    keepalive = 5
+
+
+# /metrics 는 워커별 파일(METRICS_DIR/<pid>.json)을 합산함
+# - master 시작 시: 이전 실행의 파일을 모두 지움
+# - 워커가 끝나면 (비정상 종료 포함): 그 워커 값을 dead.json 에 더해 두고 <pid>.json 은 지움
+#   → 누적값이 줄지 않고 (Prometheus 카운터), pid 가 재사용돼도 이전 값이 덮어써지지 않음
+# (server 를 import 하면 master 에서 DB 초기화가 돌므로 경로만 같은 규칙으로 계산)
+METRICS_DIR = os.environ.get(
+    "METRICS_DIR", os.environ.get("DB_PATH", "writer_test.db") + "-metrics"
+)
+METRICS_DEAD_FILE = "dead.json"
+
+
+def _read_metrics(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _merge_metrics(base, snap):
+    """snap 값을 base 에 더함 (형식은 server.Metrics.snapshot 과 같음)"""
+    counters = {(n, json.dumps(l, sort_keys=True)): [n, l, v] for n, l, v in base["counters"]}
+    for n, l, v in snap["counters"]:
+        key = (n, json.dumps(l, sort_keys=True))
+        if key in counters:
+            counters[key][2] += v
+        else:
+            counters[key] = [n, l, v]
+    histograms = {(h[0], json.dumps(h[1], sort_keys=True)): h for h in base["histograms"]}
+    for n, l, bounds, counts, total, count in snap["histograms"]:
+        key = (n, json.dumps(l, sort_keys=True))
+        h = histograms.get(key)
+        if h is None:
+            histograms[key] = [n, l, bounds, list(counts), total, count]
+        else:
+            h[3] = [a + b for a, b in zip(h[3], counts)]
+            h[4] += total
+            h[5] += count
+    return {"counters": list(counters.values()), "histograms": list(histograms.values())}
+
+
+def on_starting(server):
+    try:
+        names = os.listdir(METRICS_DIR)
+    except OSError:
+        return
+    for fname in names:
+        if fname.endswith((".json", ".tmp")):
+            try:
+                os.remove(os.path.join(METRICS_DIR, fname))
+            except OSError:
+                pass
+
+
+def worker_exit(server, worker):
+    # 워커 프로세스 안에서 호출됨: 마지막 flush 이후 값까지 파일에 남김
+    app_module = sys.modules.get("server")
+    if app_module is not None:
+        app_module.metrics.flush(force=True)
+
+
+def child_exit(server, worker):
+    path = os.path.join(METRICS_DIR, f"{worker.pid}.json")
+    snap = _read_metrics(path)
+    if snap is None:
+        return
+    dead_path = os.path.join(METRICS_DIR, METRICS_DEAD_FILE)
+    dead = _read_metrics(dead_path) or {"counters": [], "histograms": []}
+    try:
+        with open(dead_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(_merge_metrics(dead, snap), f)
+        os.replace(dead_path + ".tmp", dead_path)
+        os.remove(path)
+    except OSError:
+        server.log.exception("metrics merge failed for worker %s", worker.pid)
@@ -1,11 +1,41 @@
-from flask import Flask, request, jsonify, send_from_directory, session, redirect, make_response
+from flask import (
+    Flask, request, jsonify, send_from_directory, session, redirect, make_response,
+    g, has_app_context, Response, stream_with_context,
+)
 from flask_cors import CORS
+from werkzeug.middleware.proxy_fix import ProxyFix
 import sqlite3
+import threading
+import queue
+import mmap
+import struct
+import time
+import math
+import hashlib
+import unicodedata
+import zlib
+import json
+import re
+import logging
+import traceback
+import random
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from functools import wraps
+from contextlib import contextmanager
 import os
 import csv
+import difflib
+import gzip
+import zipfile
+import mimetypes
 from io import StringIO
+from urllib.parse import quote
+
+try:
+    import brotli  # 선택 설치: 있으면 .br 변형도 미리 만들어 둔다
+except ImportError:
+    brotli = None
 
 # 🔒 DB 경로
 # - 기본값: 현재 폴더의 writer_test.db (로컬 테스트용)
@@ -27,12 +57,18 @@ app = Flask(__name__, static_folder="static", static_url_path="")
 app.secret_key = SECRET_KEY
 CORS(app, resources={r"/api/*": {"origins": "*"}})
 
+# Render 등 앞단 프록시 1단이 붙인 X-Forwarded-For 만 믿고 remote_addr 로 사용
+# (프록시 없이 직접 띄우면 TRUSTED_PROXY_COUNT=0)
+TRUSTED_PROXY_COUNT = int(os.environ.get("TRUSTED_PROXY_COUNT", "1"))
+if TRUSTED_PROXY_COUNT:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=TRUSTED_PROXY_COUNT)
+
 
 # 👉 서버 켜면 제일 먼저 뜨는 프런트 UI (응시자용)
 @app.route("/")
 def index():
     # static 폴더 안의 "프리랜서 전체진행.html"을 메인 화면으로 사용
-    return send_from_directory(app.static_folder, "프리랜서 전체진행.html")
+    return serve_static_asset("프리랜서 전체진행.html")
 
 
 # 🔐 관리자 세션 체크 데코레이터
@@ -49,7 +85,7 @@ def require_admin(f):
 @app.route("/admin_login", methods=["GET"])
 def admin_login_page():
     # static/admin_login.html 서빙
-    return send_from_directory(app.static_folder, "admin_login.html")
+    return serve_static_asset("admin_login.html")
 
 
 # 🔐 관리자 로그인 API (비밀번호 검증)
@@ -80,7 +116,7 @@ def admin_page():
         # 로그인 안 되어 있으면 로그인 페이지로
         return redirect("/admin_login")
     # 로그인 되어 있으면 관리자 페이지 HTML 제공
-    return send_from_directory(app.static_folder, "admin_test.html")
+    return serve_static_asset("admin_test.html")
 
 
 # 🚫 관리자 HTML 직접 접근 차단 (루트 경로: /admin_test.html)
@@ -95,16 +131,583 @@ def block_admin_html_static():
     return redirect("/admin_login")
 
 
-def get_db():
-    conn = sqlite3.connect(DB_PATH)
+# ─────────────────────────
+# 정적 파일: 미리 압축 + 내용 해시 (서버 시작 시 1회)
+# ─────────────────────────
+# - static/ 아래 파일을 읽어 가볍게 줄이고(minify) gzip / brotli 로 미리 압축해 메모리에 둔다.
+# - 요청마다 Accept-Encoding 을 보고 압축본을 그대로 돌려주므로 요청당 압축 비용이 없다.
+# - ETag 는 내용 해시 (압축 방식별로 다른 값 → strong ETag).
+# - ?v=<해시> 로 요청하면 내용이 바뀌면 주소도 바뀌므로 1년 immutable 캐시,
+#   해시 없는 주소(/, /admin 등)는 no-cache 로 매번 ETag 재검증만 한다.
+# - STATIC_PRECOMPRESS=0 이면 예전처럼 send_from_directory 로 그대로 서빙 (로컬 수정 확인용)
+STATIC_PRECOMPRESS = os.environ.get("STATIC_PRECOMPRESS", "1") != "0"
+STATIC_MINIFY_EXTS = (".html", ".css", ".js")
+STATIC_COMPRESS_MIN_BYTES = 512
+STATIC_IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+# 관리자 전용 HTML: 정적 경로로는 절대 내보내지 않고 require_admin 라우트에서만 서빙
+ADMIN_ONLY_ASSETS = frozenset({"admin_test.html"})
+
+# 상대 경로 → {"hash", "content_type", "variants": {인코딩: bytes}}
+STATIC_ASSETS = {}
+
+_STATIC_REF_RE = re.compile(r'((?:src|href)=")([^"?#:]+)(")')
+
+
+def minify_text_asset(text):
+    """
+    보수적인 minify: 줄 끝 공백과 빈 줄만 제거.
+    - <pre> / <textarea> 안은 그대로 둔다.
+    - 줄 앞 들여쓰기는 템플릿 문자열 안일 수 있으므로 건드리지 않는다.
+    """
+    out = []
+    verbatim = False
+    for line in text.split("\n"):
+        lower = line.lower()
+        if "<pre" in lower or "<textarea" in lower:
+            verbatim = True
+        if verbatim:
+            out.append(line)
+        elif line.strip():
+            out.append(line.rstrip())
+        if "</pre" in lower or "</textarea" in lower:
+            verbatim = False
+    return "\n".join(out) + "\n"
+
+
+def build_static_assets(folder):
+    """
+    static/ 전체를 읽어 STATIC_ASSETS 를 채운다.
+    - HTML 안의 같은 폴더 파일 참조(src/href)는 "파일?v=해시" 로 바꿔서
+      참조 대상이 바뀌면 참조하는 페이지 해시도 같이 바뀌게 한다.
+    """
+    sources = {}
+    for root, _dirs, files in os.walk(folder):
+        for fname in files:
+            path = os.path.join(root, fname)
+            rel = os.path.relpath(path, folder).replace(os.sep, "/")
+            with open(path, "rb") as f:
+                data = f.read()
+            if rel.endswith(STATIC_MINIFY_EXTS):
+                data = minify_text_asset(data.decode("utf-8")).encode("utf-8")
+            sources[rel] = data
+
+    def content_hash(data):
+        return hashlib.sha256(data).hexdigest()[:16]
+
+    def add_version(m):
+        target = m.group(2)
+        if target not in hashes or target in ADMIN_ONLY_ASSETS:
+            return m.group(0)
+        return f"{m.group(1)}{target}?v={hashes[target]}{m.group(3)}"
+
+    # 참조가 여러 단계면 (A → B → C) 해시가 안정될 때까지 몇 번 반복
+    built = sources
+    hashes = {rel: content_hash(data) for rel, data in built.items()}
+    for _ in range(3):
+        built = {
+            rel: _STATIC_REF_RE.sub(add_version, data.decode("utf-8")).encode("utf-8")
+            if rel.endswith(".html") else data
+            for rel, data in sources.items()
+        }
+        new_hashes = {rel: content_hash(data) for rel, data in built.items()}
+        if new_hashes == hashes:
+            break
+        hashes = new_hashes
+
+    assets = {}
+    for rel, data in built.items():
+        content_type = mimetypes.guess_type(rel)[0] or "application/octet-stream"
+        if content_type.startswith("text/") or content_type == "application/javascript":
+            content_type += "; charset=utf-8"
+
+        variants = {"identity": data}
+        if len(data) >= STATIC_COMPRESS_MIN_BYTES:
+            gz = gzip.compress(data, compresslevel=9, mtime=0)
+            if len(gz) < len(data):
+                variants["gzip"] = gz
+            if brotli is not None:
+                br = brotli.compress(data, quality=11)
+                if len(br) < len(data):
+                    variants["br"] = br
+
+        assets[rel] = {
+            "hash": content_hash(data),
+            "content_type": content_type,
+            "variants": variants,
+        }
+    return assets
+
+
+def pick_encoding(variants):
+    """Accept-Encoding 에서 허용된 것 중 가장 작은 변형 선택 (없으면 identity)"""
+    accepted = request.accept_encodings
+    best = "identity"
+    for enc in ("br", "gzip"):
+        if enc in variants and accepted[enc] > 0:
+            if len(variants[enc]) < len(variants[best]):
+                best = enc
+    return best
+
+
+def serve_static_asset(filename):
+    """
+    미리 압축해 둔 정적 파일 응답.
+    - 목록에 없는 파일(시작 후 추가 등)이나 STATIC_PRECOMPRESS=0 이면 send_from_directory 로 대체
+    """
+    asset = STATIC_ASSETS.get(filename)
+    if asset is None:
+        return send_from_directory(app.static_folder, filename)
+
+    variants = asset["variants"]
+    encoding = pick_encoding(variants)
+    etag = asset["hash"] if encoding == "identity" else f"{asset['hash']}-{encoding}"
+
+    if request.if_none_match.contains(etag):
+        resp = Response(status=304)
+    else:
+        resp = Response(variants[encoding], content_type=asset["content_type"])
+        if encoding != "identity":
+            resp.headers["Content-Encoding"] = encoding
+
+    resp.set_etag(etag)
+    if len(variants) > 1:
+        resp.vary.add("Accept-Encoding")
+    if request.args.get("v") == asset["hash"]:
+        resp.headers["Cache-Control"] = f"public, max-age={STATIC_IMMUTABLE_MAX_AGE}, immutable"
+    elif filename in ADMIN_ONLY_ASSETS:
+        resp.headers["Cache-Control"] = "private, no-cache"
+    else:
+        resp.headers["Cache-Control"] = "no-cache"
+    return resp
+
+
+def static_asset_view(filename):
+    # Flask 기본 static 라우트(/<path:filename>)를 대체
+    if filename in ADMIN_ONLY_ASSETS:
+        return redirect("/admin_login")
+    return serve_static_asset(filename)
+
+
+if STATIC_PRECOMPRESS:
+    STATIC_ASSETS = build_static_assets(app.static_folder)
+app.view_functions["static"] = static_asset_view
+
+
+# ─────────────────────────
+# 관측 지표 (/metrics, Prometheus 텍스트 형식)
+# ─────────────────────────
+# - 카운터 / 히스토그램을 워커 프로세스 메모리에 모으고, 몇 초마다
+#   METRICS_DIR/<pid>.json 으로 내려 쓴다.
+# - /metrics 는 모든 워커 파일을 합산해서 출력 (gunicorn 멀티 프로세스 대응).
+#   끝난 워커의 값은 gunicorn.conf.py 의 child_exit 가 dead.json 에 더해 두므로
+#   워커가 재시작돼도 누적값이 줄어들지 않는다.
+# - fork 이후 첫 기록 때 부모에게서 물려받은 값은 버린다 (이중 집계 방지).
+METRICS_DIR = os.environ.get("METRICS_DIR", DB_PATH + "-metrics")
+METRICS_FLUSH_SECONDS = float(os.environ.get("METRICS_FLUSH_SECONDS", "5"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+DB_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5)
+BATCH_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+# 이름 → (종류, 설명)
+METRIC_HELP = {
+    "http_requests_total": ("counter", "HTTP 요청 수 (route, method, status)"),
+    "http_request_duration_seconds": ("histogram", "HTTP 요청 처리 시간"),
+    "db_query_duration_seconds": ("histogram", "SQLite 문 실행 시간 (op, role)"),
+    "db_lock_wait_seconds": ("histogram", "BEGIN IMMEDIATE 쓰기 잠금 대기 시간"),
+    "db_lock_errors_total": ("counter", "database is locked 오류 수"),
+    "writer_test_register_total": ("counter", "register 결과 (new / resumed / 거절 사유)"),
+    "writer_test_submit_total": ("counter", "submit 결과 (ok / 거절 사유)"),
+    "writer_test_draft_saves_total": ("counter", "save_draft 결과 (mode, result)"),
+    "writer_test_write_rejected_total": ("counter", "요청 제한으로 거절된 쓰기 요청"),
+    "writer_test_draft_batch_ops": ("histogram", "묶음 쓰기 한 번에 커밋한 저장 요청 수"),
+    "writer_test_jobs_total": ("counter", "백그라운드 작업 처리 결과 (kind, result)"),
+}
+
+
+class Metrics:
+    def __init__(self, directory):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._pid = None
+        self._counters = {}  # (이름, 라벨 튜플) → 값
+        self._histograms = {}  # (이름, 라벨 튜플) → [버킷, 버킷별 개수, 합계, 개수]
+        self._last_flush = 0.0
+
+    def _check_pid(self):
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._counters = {}
+            self._histograms = {}
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._check_pid()
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, buckets=LATENCY_BUCKETS, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._check_pid()
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = [list(buckets), [0] * len(buckets), 0.0, 0]
+            for i, bound in enumerate(hist[0]):
+                if value <= bound:
+                    hist[1][i] += 1
+                    break
+            hist[2] += value
+            hist[3] += 1
+
+    def snapshot(self):
+        with self._lock:
+            self._check_pid()
+            return {
+                "counters": [[n, dict(l), v] for (n, l), v in self._counters.items()],
+                "histograms": [
+                    [n, dict(l), h[0], list(h[1]), h[2], h[3]]
+                    for (n, l), h in self._histograms.items()
+                ],
+            }
+
+    def flush(self, force=False):
+        """몇 초에 한 번 이 프로세스 값을 파일로 기록 (임시 파일 → rename)"""
+        now = time.monotonic()
+        if not force and now - self._last_flush < METRICS_FLUSH_SECONDS:
+            return
+        self._last_flush = now
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, f"{os.getpid()}.json")
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(self.snapshot(), f)
+            os.replace(path + ".tmp", path)
+        except OSError:
+            logger.exception("metrics flush failed")
+
+    def clear(self):
+        """
+        이전 실행의 워커 파일 삭제 (서버 시작 시 한 번).
+        - gunicorn 은 gunicorn.conf.py 의 on_starting 훅이 같은 일을 함
+        """
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for fname in names:
+            if fname.endswith((".json", ".tmp")):
+                try:
+                    os.remove(os.path.join(self.directory, fname))
+                except OSError:
+                    pass
+
+    def collect(self):
+        """모든 워커 파일 + 현재 프로세스 실시간 값 합산"""
+        snapshots = [self.snapshot()]
+        own = f"{os.getpid()}.json"
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            names = []
+        for fname in names:
+            if not fname.endswith(".json") or fname == own:
+                continue
+            try:
+                with open(os.path.join(self.directory, fname), encoding="utf-8") as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+
+        counters = {}
+        histograms = {}
+        for snap in snapshots:
+            for name, labels, value in snap["counters"]:
+                key = (name, tuple(sorted(labels.items())))
+                counters[key] = counters.get(key, 0) + value
+            for name, labels, bounds, counts, total, count in snap["histograms"]:
+                key = (name, tuple(sorted(labels.items())))
+                hist = histograms.setdefault(key, [bounds, [0] * len(bounds), 0.0, 0])
+                hist[1] = [a + b for a, b in zip(hist[1], counts)]
+                hist[2] += total
+                hist[3] += count
+        return counters, histograms
+
+    def render(self):
+        counters, histograms = self.collect()
+
+        def fmt_labels(labels, extra=()):
+            items = list(labels) + list(extra)
+            if not items:
+                return ""
+            esc = lambda v: str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in items) + "}"
+
+        by_name = {}
+        for (name, labels), value in counters.items():
+            by_name.setdefault(name, []).append(f"{name}{fmt_labels(labels)} {value}")
+        for (name, labels), (bounds, counts, total, count) in histograms.items():
+            lines = by_name.setdefault(name, [])
+            cumulative = 0
+            for bound, n in zip(bounds, counts):
+                cumulative += n
+                lines.append(f"{name}_bucket{fmt_labels(labels, [('le', bound)])} {cumulative}")
+            lines.append(f"{name}_bucket{fmt_labels(labels, [('le', '+Inf')])} {count}")
+            lines.append(f"{name}_sum{fmt_labels(labels)} {total}")
+            lines.append(f"{name}_count{fmt_labels(labels)} {count}")
+
+        out = []
+        for name in sorted(by_name):
+            kind, help_text = METRIC_HELP.get(name, ("untyped", name))
+            out.append(f"# HELP {name} {help_text}")
+            out.append(f"# TYPE {name} {kind}")
+            out.extend(sorted(by_name[name]) if kind == "counter" else by_name[name])
+        return "\n".join(out) + "\n"
+
+
+metrics = Metrics(METRICS_DIR)
+
+
+def _statement_op(sql):
+    # 라벨 종류를 고정하기 위해 첫 단어만 사용 (select / insert / update / ...)
+    word = sql.lstrip().split(None, 1)[0].lower() if sql and sql.strip() else "other"
+    return word if word in ("select", "insert", "update", "delete", "begin", "pragma") else "other"
+
+
+def is_lock_error(e):
+    # SQLITE_BUSY / SQLITE_LOCKED (busy_timeout 을 넘겨 잠금을 못 얻은 경우)
+    if not isinstance(e, sqlite3.OperationalError):
+        return False
+    message = str(e)
+    return "locked" in message or "busy" in message
+
+
+class TimedCursor(sqlite3.Cursor):
+    def _timed(self, method, sql, *args):
+        started = time.perf_counter()
+        try:
+            return method(sql, *args)
+        except sqlite3.OperationalError as e:
+            if is_lock_error(e):
+                metrics.inc("db_lock_errors_total", role=self.connection.metrics_role)
+            raise
+        finally:
+            metrics.observe(
+                "db_query_duration_seconds",
+                time.perf_counter() - started,
+                buckets=DB_BUCKETS,
+                op=_statement_op(sql),
+                role=self.connection.metrics_role,
+            )
+
+    def execute(self, sql, parameters=()):
+        return self._timed(super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._timed(super().executemany, sql, seq_of_parameters)
+
+
+class TimedConnection(sqlite3.Connection):
+    """모든 execute 가 TimedCursor 를 거치도록 하는 연결 (conn.execute 도 cursor() 를 부름)"""
+    metrics_role = "write"
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+
+@app.before_request
+def metrics_start_timer():
+    g.metrics_started = time.perf_counter()
+
+
+@app.after_request
+def metrics_record_request(response):
+    started = g.get("metrics_started")
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        metrics.observe(
+            "http_request_duration_seconds",
+            time.perf_counter() - started,
+            route=route,
+            method=request.method,
+        )
+        metrics.inc(
+            "http_requests_total", route=route, method=request.method, status=response.status_code
+        )
+    metrics.flush()
+    return response
+
+
+# ─────────────────────────
+# DB 연결 관리
+# ─────────────────────────
+# - 쓰기용: 스레드(=gunicorn worker/thread)마다 1개의 연결을 계속 재사용
+#   → 요청 하나 안에서 get_db()를 여러 번 불러도 같은 연결을 쓴다.
+# - 읽기용: query_only 로 열어 둔 연결 풀 (관리자 GET API 용)
+#   → WAL 모드라서 응시자 임시저장(쓰기) 중에도 관리자 목록 조회가 막히지 않음
+DB_BUSY_TIMEOUT_MS = int(os.environ.get("DB_BUSY_TIMEOUT_MS", "5000"))
+DB_CACHE_SIZE_KB = int(os.environ.get("DB_CACHE_SIZE_KB", "16384"))
+DB_MMAP_SIZE = int(os.environ.get("DB_MMAP_SIZE", str(128 * 1024 * 1024)))
+DB_READER_POOL_SIZE = int(os.environ.get("DB_READER_POOL_SIZE", "4"))
+
+_db_local = threading.local()
+_reader_pool = queue.LifoQueue()
+_reader_pool_pid = os.getpid()
+
+
+def _open_connection(readonly=False):
+    conn = sqlite3.connect(
+        DB_PATH,
+        timeout=DB_BUSY_TIMEOUT_MS / 1000,
+        # 읽기 풀 연결은 요청마다 다른 스레드에서 꺼내 쓸 수 있음
+        check_same_thread=not readonly,
+        factory=TimedConnection,  # 문 실행 시간 / 잠금 오류를 지표로 기록
+    )
+    conn.metrics_role = "read" if readonly else "write"
     conn.row_factory = sqlite3.Row
+    cur = conn.cursor()
+    if not readonly:
+        # 새 DB 에서만 적용됨 (테이블이 생기기 전 + WAL 전환 전). 삭제로 생긴 빈 페이지를
+        # check_db.py vacuum 이 조금씩 돌려줄 수 있게. 기존 DB 는 그대로 (check_db.py vacuum --enable)
+        cur.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        # WAL 은 DB 파일에 영구 저장되는 설정이지만, 처음 여는 DB를 위해 매번 확인
+        cur.execute("PRAGMA journal_mode=WAL")
+    cur.execute("PRAGMA synchronous=NORMAL")  # WAL 에서는 NORMAL 로도 커밋 내구성 충분
+    cur.execute(f"PRAGMA busy_timeout={DB_BUSY_TIMEOUT_MS}")
+    cur.execute(f"PRAGMA cache_size=-{DB_CACHE_SIZE_KB}")
+    cur.execute(f"PRAGMA mmap_size={DB_MMAP_SIZE}")
+    cur.execute("PRAGMA temp_store=MEMORY")
+    if readonly:
+        cur.execute("PRAGMA query_only=1")
+    cur.close()
+    # 트리거(전문 검색 색인)에서 압축된 본문을 풀 때 사용
+    conn.create_function("unpack_body", 1, unpack_body, deterministic=True)
+    return conn
+
+
+def get_db():
+    """
+    현재 스레드의 쓰기용 연결을 반환 (없으면 새로 연결).
+    - 연결은 닫지 않고 재사용하므로 호출하는 쪽에서 close() 하지 않는다.
+    - gunicorn --preload 로 fork 된 경우 부모 프로세스의 연결은 버리고 새로 연결.
+    """
+    conn = getattr(_db_local, "conn", None)
+    if conn is None or _db_local.pid != os.getpid():
+        conn = _open_connection()
+        _db_local.conn = conn
+        _db_local.pid = os.getpid()
+    return conn
+
+
+def get_read_db():
+    """
+    읽기 전용(query_only) 연결을 풀에서 꺼내 반환.
+    - 요청 하나 동안 같은 연결을 쓰고, 요청이 끝나면 풀로 돌려준다.
+    - 요청 밖(app context 없음)에서는 get_db() 연결을 그대로 사용.
+    """
+    global _reader_pool, _reader_pool_pid
+    if not has_app_context():
+        return get_db()
+
+    conn = g.get("read_db")
+    if conn is not None:
+        return conn
+
+    if _reader_pool_pid != os.getpid():
+        _reader_pool = queue.LifoQueue()
+        _reader_pool_pid = os.getpid()
+
+    try:
+        conn = _reader_pool.get_nowait()
+    except queue.Empty:
+        conn = _open_connection(readonly=True)
+    g.read_db = conn
     return conn
 
 
+@contextmanager
+def write_transaction(conn=None):
+    """
+    BEGIN IMMEDIATE 로 쓰기 잠금을 먼저 잡고 블록 전체를 한 트랜잭션으로 실행.
+    - 정상 종료 시 commit, 예외 시 rollback
+    - 연결에 이미 열린 트랜잭션이 있으면 호출한 쪽이 끝내지 못한 쓰기이므로
+      커밋하지 않고 되돌린 뒤 시작 (반쯤 된 쓰기가 저장되지 않게)
+    """
+    conn = conn or get_db()
+    if conn.in_transaction:
+        logger.warning("write_transaction: rolling back a transaction left open on this connection")
+        conn.rollback()
+    started = time.perf_counter()
+    conn.execute("BEGIN IMMEDIATE")
+    metrics.observe("db_lock_wait_seconds", time.perf_counter() - started, buckets=DB_BUCKETS)
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+
+
+@app.teardown_appcontext
+def release_db(exc):
+    # 쓰기 연결: 커밋되지 않은 트랜잭션이 남아 있으면 되돌림 (연결은 유지)
+    conn = getattr(_db_local, "conn", None)
+    if conn is not None and _db_local.pid == os.getpid() and conn.in_transaction:
+        conn.rollback()
+
+    # 읽기 연결: 풀로 반환 (풀이 가득 차 있으면 닫음)
+    read_conn = g.pop("read_db", None)
+    if read_conn is not None:
+        if _reader_pool_pid == os.getpid() and _reader_pool.qsize() < DB_READER_POOL_SIZE:
+            _reader_pool.put(read_conn)
+        else:
+            read_conn.close()
+
+
+# ─────────────────────────
+# DB 스키마 마이그레이션 (PRAGMA user_version)
+# ─────────────────────────
+# - 번호 순서대로 한 번씩만 실행되고, 실행 후 user_version 을 올린다.
+# - 이미 최신이면 워커 시작 시 user_version 한 번 읽고 끝.
+# - 새 스키마 변경은 기존 함수를 고치지 말고 번호를 올려 새로 추가할 것.
+MIGRATIONS = []
+
+
+def migration(version):
+    def decorator(f):
+        MIGRATIONS.append((version, f))
+        MIGRATIONS.sort(key=lambda m: m[0])
+        return f
+    return decorator
+
+
 def init_db():
+    """
+    스키마를 최신 버전으로 맞춤.
+    - 여러 워커가 동시에 시작해도 BEGIN IMMEDIATE 잠금 안에서 버전을 다시 확인하므로
+      각 마이그레이션은 한 번만 실행된다.
+    """
     conn = get_db()
-    cur = conn.cursor()
+    latest = MIGRATIONS[-1][0]
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= latest:
+        return
+
+    with write_transaction(conn):
+        cur = conn.cursor()
+        current = cur.execute("PRAGMA user_version").fetchone()[0]
+        for version, apply in MIGRATIONS:
+            if version > current:
+                apply(cur)
+                cur.execute(f"PRAGMA user_version={version}")
+
 
+@migration(1)
+def migrate_base_schema(cur):
+    """
+    기본 스키마 (user_version 도입 이전 init_db 가 하던 일 전부).
+    - 예전 DB(user_version=0)에도 그대로 적용되도록 IF NOT EXISTS / 컬럼 확인으로 작성
+    """
     # 설정 테이블 (test_open 등)
     cur.execute(
         """
@@ -123,13 +726,60 @@ def init_db():
             name TEXT NOT NULL,
             birth_year TEXT NOT NULL,
             phone_last4 TEXT NOT NULL,
+            identity_key TEXT,
             title TEXT,
-            body TEXT,
             char_count INTEGER DEFAULT 0,
             status TEXT NOT NULL DEFAULT 'pending', -- pending | pass | fail | return
             created_at TEXT NOT NULL,
             submitted_at TEXT,
-            deadline_at TEXT NOT NULL
+            deadline_at TEXT NOT NULL,
+            draft_rev INTEGER NOT NULL DEFAULT 0 -- 임시저장/제출 때마다 +1 (부분 저장 충돌 확인용)
+        )
+        """
+    )
+
+    # 본문 테이블 (zlib 압축)
+    # - writer_tests 행을 짧게 유지해서 목록/상태 조회가 작은 페이지만 읽도록 본문은 따로 보관
+    # - body_len: 압축 전 UTF-8 바이트 수
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS writer_test_bodies (
+            test_id INTEGER PRIMARY KEY,
+            body BLOB NOT NULL,
+            body_len INTEGER NOT NULL
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS writer_tests_delete_body
+        AFTER DELETE ON writer_tests
+        BEGIN
+            DELETE FROM writer_test_bodies WHERE test_id = old.id;
+        END
+        """
+    )
+
+    # TEST 종료 시 초기화 전에 옮겨 두는 보관 테이블 (export_and_reset)
+    # - body 는 writer_test_bodies 의 압축 데이터를 그대로 복사 (예전 행은 TEXT)
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS writer_tests_archive (
+            archive_batch TEXT NOT NULL,
+            archived_at TEXT NOT NULL,
+            id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            birth_year TEXT NOT NULL,
+            phone_last4 TEXT NOT NULL,
+            identity_key TEXT,
+            title TEXT,
+            body TEXT,
+            char_count INTEGER DEFAULT 0,
+            status TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            submitted_at TEXT,
+            deadline_at TEXT NOT NULL,
+            PRIMARY KEY (archive_batch, id)
         )
         """
     )
@@ -142,6 +792,7 @@ def init_db():
             name TEXT NOT NULL,
             birth_year TEXT NOT NULL,
             phone_last4 TEXT NOT NULL,
+            identity_key TEXT,
             reason TEXT,
             created_at TEXT NOT NULL
         )
@@ -154,109 +805,1457 @@ def init_db():
         ("test_open", "1"),
     )
 
-    conn.commit()
-    conn.close()
+    # 기존 DB: draft_rev 컬럼 추가
+    columns = [r["name"] for r in cur.execute("PRAGMA table_info(writer_tests)")]
+    if "draft_rev" not in columns:
+        cur.execute("ALTER TABLE writer_tests ADD COLUMN draft_rev INTEGER NOT NULL DEFAULT 0")
 
+    # 기존 DB: writer_tests.body → writer_test_bodies (압축) 로 옮기고 컬럼 삭제
+    if "body" in columns:
+        rows = cur.execute(
+            "SELECT id, body FROM writer_tests WHERE body IS NOT NULL AND body != ''"
+        ).fetchall()
+        cur.executemany(
+            """
+            INSERT OR REPLACE INTO writer_test_bodies (test_id, body, body_len)
+            VALUES (?, ?, ?)
+            """,
+            [(r["id"],) + pack_body(r["body"]) for r in rows],
+        )
+        cur.execute("ALTER TABLE writer_tests DROP COLUMN body")
 
-def is_blacklisted(name, birth_year, phone_last4):
-    conn = get_db()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT 1 FROM blacklist
-        WHERE name=? AND birth_year=? AND phone_last4=?
-        LIMIT 1
-        """,
-        (name, birth_year, phone_last4),
-    )
-    row = cur.fetchone()
-    conn.close()
-    return row is not None
+    # 기존 DB: identity_key 컬럼 추가 + 채우기
+    for table in ("writer_tests", "blacklist"):
+        columns = [r["name"] for r in cur.execute(f"PRAGMA table_info({table})")]
+        if "identity_key" not in columns:
+            cur.execute(f"ALTER TABLE {table} ADD COLUMN identity_key TEXT")
+        rows = cur.execute(
+            f"SELECT id, name, birth_year, phone_last4 FROM {table} WHERE identity_key IS NULL"
+        ).fetchall()
+        cur.executemany(
+            f"UPDATE {table} SET identity_key=? WHERE id=?",
+            [
+                (identity_key(r["name"], r["birth_year"], r["phone_last4"]), r["id"])
+                for r in rows
+            ],
+        )
 
 
-def get_test_open():
-    conn = get_db()
-    cur = conn.cursor()
-    cur.execute("SELECT value FROM config WHERE key='test_open'")
-    row = cur.fetchone()
-    conn.close()
-    if not row:
-        return True
-    return row["value"] == "1"
+@migration(2)
+def migrate_lookup_indexes(cur):
+    """조회 경로별 인덱스 (register / blacklist / 상태·제출시각 / 글자수 정렬)"""
+    # register: WHERE identity_key=? ORDER BY id DESC LIMIT 1
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_writer_tests_identity ON writer_tests (identity_key, id)"
+    )
+    # blacklist_remove: WHERE identity_key=?
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_blacklist_identity ON blacklist (identity_key)"
+    )
+    # 목록/집계: status 필터 + 제출시각
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_writer_tests_status_submitted "
+        "ON writer_tests (status, submitted_at)"
+    )
+    # 목록: 글자수 정렬 keyset (char_count, id)
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_writer_tests_char_count ON writer_tests (char_count, id)"
+    )
 
 
-def set_test_open(flag: bool):
-    conn = get_db()
-    cur = conn.cursor()
+@migration(3)
+def migrate_jobs(cur):
+    """백그라운드 작업 큐 (제출 후 분석 등)"""
     cur.execute(
-        "INSERT INTO config (key, value) VALUES (?, ?) "
-        "ON CONFLICT(key) DO UPDATE SET value=excluded.value",
-        ("test_open", "1" if flag else "0"),
+        """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            test_id INTEGER,                         -- 관련 TEST (없으면 NULL)
+            payload TEXT NOT NULL DEFAULT '{}',      -- JSON
+            status TEXT NOT NULL DEFAULT 'queued',   -- queued | running | done | failed
+            attempts INTEGER NOT NULL DEFAULT 0,
+            max_attempts INTEGER NOT NULL DEFAULT 3,
+            run_after TEXT NOT NULL,                 -- 이 시각 이후에 실행 (재시도 대기)
+            locked_by TEXT,
+            locked_at TEXT,
+            last_error TEXT,
+            result TEXT,                             -- JSON
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+        """
     )
-    conn.commit()
-    conn.close()
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status_run_after ON jobs (status, run_after)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_jobs_test_id ON jobs (test_id)")
 
-def export_writer_tests_csv():
+
+@migration(4)
+def migrate_minhash(cur):
     """
-    writer_tests 전체 내용을 CSV 문자열로 반환.
-    - 관리자 페이지에서 다운로드하여 PC에 보관용
+    유사 제출 탐지용 MinHash 서명 + LSH 밴드 인덱스.
+    - writer_tests 행이 삭제/보관되어도 남겨 둠 (이전 회차와 비교하기 위해)
     """
-    conn = get_db()
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM writer_tests ORDER BY id ASC")
-    rows = cur.fetchall()
-
-    # 컬럼명 추출
-    columns = [d[0] for d in cur.description]
-
-    output = StringIO()
-    writer = csv.writer(output)
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS minhash_signatures (
+            test_id INTEGER PRIMARY KEY,
+            signature BLOB NOT NULL,
+            shingle_count INTEGER NOT NULL,
+            created_at TEXT NOT NULL
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS minhash_bands (
+            band INTEGER NOT NULL,
+            bucket INTEGER NOT NULL,
+            test_id INTEGER NOT NULL,
+            PRIMARY KEY (band, bucket, test_id)
+        ) WITHOUT ROWID
+        """
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_minhash_bands_test ON minhash_bands (test_id)")
 
-    # 헤더
-    writer.writerow(columns)
+    # 이미 제출된 TEST / 보관된 TEST 는 작업 큐로 서명 계산
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    for table in ("writer_tests", "writer_tests_archive"):
+        cur.execute(
+            f"""
+            INSERT INTO jobs (kind, test_id, payload, run_after, created_at, updated_at)
+            SELECT 'minhash', id, '{{"testId": ' || id || '}}', ?, ?, ?
+            FROM {table}
+            WHERE submitted_at IS NOT NULL
+            """,
+            (now, now, now),
+        )
 
-    # 데이터
-    for r in rows:
-        writer.writerow([r[col] for col in columns])
 
-    conn.close()
-    return output.getvalue()
+def fts_trigram_available(cur):
+    try:
+        cur.execute("CREATE VIRTUAL TABLE temp.fts_probe USING fts5(x, tokenize='trigram')")
+    except sqlite3.OperationalError:
+        return False
+    cur.execute("DROP TABLE temp.fts_probe")
+    return True
 
 
-def reset_writer_tests():
+@migration(5)
+def migrate_fulltext_search(cur):
     """
-    writer_tests 내용만 모두 삭제 (DB 파일 삭제 X, 구조 유지)
-    - test 진행 중에는 호출하면 안 되며,
-      반드시 test_open 이 0(종료)일 때만 사용해야 함.
+    제목/본문 전문 검색 (FTS5, trigram → 한글 부분 문자열 검색 가능).
+    - rowid = writer_tests.id, writer_tests / writer_test_bodies 트리거로 동기화
+    - SQLite 에 FTS5 trigram 이 없으면 건너뜀 (검색 API 는 느린 방식으로 동작)
     """
-    conn = get_db()
-    cur = conn.cursor()
-    cur.execute("DELETE FROM writer_tests")
-    conn.commit()
-    conn.close()
+    if not fts_trigram_available(cur):
+        return
 
+    cur.execute(
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS writer_tests_fts
+        USING fts5(title, body, tokenize='trigram')
+        """
+    )
+    for sql in (
+        """
+        CREATE TRIGGER IF NOT EXISTS writer_tests_fts_insert
+        AFTER INSERT ON writer_tests
+        BEGIN
+            INSERT OR REPLACE INTO writer_tests_fts (rowid, title, body)
+            VALUES (new.id, new.title, '');
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS writer_tests_fts_title
+        AFTER UPDATE OF title ON writer_tests
+        BEGIN
+            UPDATE writer_tests_fts SET title = new.title WHERE rowid = new.id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS writer_tests_fts_delete
+        AFTER DELETE ON writer_tests
+        BEGIN
+            DELETE FROM writer_tests_fts WHERE rowid = old.id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS writer_test_bodies_fts_insert
+        AFTER INSERT ON writer_test_bodies
+        BEGIN
+            UPDATE writer_tests_fts SET body = unpack_body(new.body) WHERE rowid = new.test_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS writer_test_bodies_fts_update
+        AFTER UPDATE OF body ON writer_test_bodies
+        BEGIN
+            UPDATE writer_tests_fts SET body = unpack_body(new.body) WHERE rowid = new.test_id;
+        END
+        """,
+    ):
+        cur.execute(sql)
 
-# ─────────────────────────
-# 1) 관리자/응시 공통: TEST 오픈 상태
-# ─────────────────────────
-@app.route("/api/writer-test/config", methods=["GET"])
-def api_config():
-    return jsonify({"test_open": get_test_open()})
+    # 기존 행 색인
+    cur.execute(
+        """
+        INSERT OR REPLACE INTO writer_tests_fts (rowid, title, body)
+        SELECT w.id, w.title, unpack_body(b.body)
+        FROM writer_tests w
+        LEFT JOIN writer_test_bodies b ON b.test_id = w.id
+        """
+    )
 
 
-@app.route("/api/writer-test/set_open_flag", methods=["POST"])
-@require_admin
-def api_set_open_flag():
-    data = request.get_json(force=True)
-    flag = bool(data.get("test_open", True))
-    set_test_open(flag)
-    return jsonify({"ok": True, "test_open": flag})
+# writer_tests 에서 바뀌면 관리자 화면에 다시 보내야 하는 컬럼
+CHANGE_TRACKED_COLUMNS = (
+    "name", "birth_year", "phone_last4", "title", "char_count", "status",
+    "created_at", "submitted_at", "deadline_at", "draft_rev",
+)
 
 
-# ─────────────────────────
-# 2) 응시자: TEST 시작 전 등록 (이름/연도/뒷자리)
-# ─────────────────────────
-@app.route("/api/writer-test/register", methods=["POST"])
+@migration(6)
+def migrate_change_feed(cur):
+    """
+    관리자 화면 증분 갱신용 변경 번호.
+    - change_seq('writer_tests'): 추가/수정/삭제 때마다 +1 되는 전역 번호
+    - writer_tests.change_rev: 그 행이 마지막으로 바뀐 번호
+    - writer_test_deletions: 삭제된 id 와 삭제 시점 번호
+    """
+    columns = [r["name"] for r in cur.execute("PRAGMA table_info(writer_tests)")]
+    if "change_rev" not in columns:
+        cur.execute("ALTER TABLE writer_tests ADD COLUMN change_rev INTEGER NOT NULL DEFAULT 0")
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS change_seq (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS writer_test_deletions (
+            id INTEGER PRIMARY KEY,
+            change_rev INTEGER NOT NULL
+        )
+        """
+    )
+
+    # 기존 행: id 순서대로 번호 부여
+    cur.execute("UPDATE writer_tests SET change_rev = id")
+    cur.execute(
+        "INSERT OR REPLACE INTO change_seq (name, value) "
+        "SELECT 'writer_tests', COALESCE(MAX(id), 0) FROM writer_tests"
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_writer_tests_change_rev ON writer_tests (change_rev)"
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_writer_test_deletions_rev "
+        "ON writer_test_deletions (change_rev)"
+    )
+
+    bump = "UPDATE change_seq SET value = value + 1 WHERE name = 'writer_tests';"
+    seq = "(SELECT value FROM change_seq WHERE name = 'writer_tests')"
+    cur.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS writer_tests_change_insert
+        AFTER INSERT ON writer_tests
+        BEGIN
+            {bump}
+            UPDATE writer_tests SET change_rev = {seq} WHERE id = new.id;
+        END
+        """
+    )
+    cur.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS writer_tests_change_update
+        AFTER UPDATE OF {", ".join(CHANGE_TRACKED_COLUMNS)} ON writer_tests
+        BEGIN
+            {bump}
+            UPDATE writer_tests SET change_rev = {seq} WHERE id = new.id;
+        END
+        """
+    )
+    cur.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS writer_tests_change_delete
+        AFTER DELETE ON writer_tests
+        BEGIN
+            {bump}
+            INSERT OR REPLACE INTO writer_test_deletions (id, change_rev) VALUES (old.id, {seq});
+        END
+        """
+    )
+
+
+@migration(7)
+def migrate_rounds(cur):
+    """
+    회차(round) 목록. 마감된 회차의 행은 ROUNDS_DIR/<파일> 의 별도 DB 로 옮겨 둔다.
+    - status: copying (옮기는 중, 다시 마감하면 이어서 진행) | closed
+    - min_id / max_id: 이 회차에 들어간 TEST id 범위 (id 는 AUTOINCREMENT 라 회차끼리 겹치지 않음)
+    """
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS rounds (
+            name TEXT PRIMARY KEY,
+            file TEXT NOT NULL,
+            status TEXT NOT NULL,
+            row_count INTEGER NOT NULL DEFAULT 0,
+            min_id INTEGER,
+            max_id INTEGER,
+            started_at TEXT NOT NULL,
+            closed_at TEXT
+        )
+        """
+    )
+
+
+@migration(8)
+def migrate_draft_revisions(cur):
+    """
+    임시저장/제출 수정 이력. 커밋된 본문 상태마다 한 행 (rev = 그때의 draft_rev).
+    - kind: snapshot (본문 전체, zlib) | delta (바로 앞 이력 대비 [start, end, text], zlib)
+    - chain_len / chain_bytes: 마지막 snapshot 이후 delta 개수 / 압축 크기 합
+    - TEST 가 삭제되면 (회차 마감 포함) 이력도 함께 삭제
+    """
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS writer_test_revisions (
+            test_id INTEGER NOT NULL,
+            rev INTEGER NOT NULL,
+            kind TEXT NOT NULL,
+            data BLOB NOT NULL,
+            title TEXT,
+            char_count INTEGER,
+            body_len INTEGER,
+            chain_len INTEGER NOT NULL DEFAULT 0,
+            chain_bytes INTEGER NOT NULL DEFAULT 0,
+            source TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            PRIMARY KEY (test_id, rev)
+        ) WITHOUT ROWID
+        """
+    )
+    cur.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS writer_tests_delete_revisions
+        AFTER DELETE ON writer_tests
+        BEGIN
+            DELETE FROM writer_test_revisions WHERE test_id = old.id;
+        END
+        """
+    )
+
+
+# 집계 통계 (writer_test_stats) 항목: (metric, 키 식, 조건 식). {r} 자리에 new / old
+# - status: 상태별 건수 / phase: 제출(submitted) · 미제출(draft) 건수
+# - length: 제출된 TEST 의 글자수 구간 (STATS_LENGTH_BUCKET 단위, 마지막 구간은 그 이상 전부)
+# - hour: 제출 시각별 건수 ('YYYY-MM-DD HH')
+STATS_LENGTH_BUCKET = 1000
+STATS_LENGTH_BUCKETS = 10
+_STATS_SUBMITTED = "COALESCE({r}.submitted_at, '') != ''"
+STATS_METRICS = (
+    ("status", "{r}.status", "1"),
+    ("phase", f"CASE WHEN {_STATS_SUBMITTED} THEN 'submitted' ELSE 'draft' END", "1"),
+    (
+        "length",
+        f"CAST(MIN(COALESCE({{r}}.char_count, 0) / {STATS_LENGTH_BUCKET}, {STATS_LENGTH_BUCKETS})"
+        f" * {STATS_LENGTH_BUCKET} AS TEXT)",
+        _STATS_SUBMITTED,
+    ),
+    ("hour", "substr({r}.submitted_at, 1, 13)", _STATS_SUBMITTED),
+)
+
+
+@migration(9)
+def migrate_stats(cur):
+    """
+    관리자 대시보드용 집계 (writer_tests 트리거로 유지 → 조회는 행 몇 개만 읽음).
+    - (metric, key) → value. 항목은 STATS_METRICS 참고
+    - 수정 트리거는 집계에 쓰이는 값이 바뀔 때만 동작 (임시저장마다 도는 char_count 변경은 건너뜀)
+    """
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS writer_test_stats (
+            metric TEXT NOT NULL,
+            key TEXT NOT NULL,
+            value INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (metric, key)
+        ) WITHOUT ROWID
+        """
+    )
+
+    # 기존 행으로 채우기
+    cur.execute("DELETE FROM writer_test_stats")
+    for metric, key, cond in STATS_METRICS:
+        key_sql = key.format(r="w")
+        cur.execute(
+            f"""
+            INSERT INTO writer_test_stats (metric, key, value)
+            SELECT '{metric}', {key_sql}, COUNT(*) FROM writer_tests w
+            WHERE {cond.format(r="w")}
+            GROUP BY {key_sql}
+            """
+        )
+
+    def add(r):
+        return "\n".join(
+            f"""
+            INSERT INTO writer_test_stats (metric, key, value)
+            SELECT '{metric}', {key.format(r=r)}, 1 WHERE {cond.format(r=r)}
+            ON CONFLICT (metric, key) DO UPDATE SET value = value + 1;"""
+            for metric, key, cond in STATS_METRICS
+        )
+
+    def sub(r):
+        return "\n".join(
+            f"""
+            UPDATE writer_test_stats SET value = value - 1
+            WHERE metric = '{metric}' AND key = {key.format(r=r)} AND {cond.format(r=r)};"""
+            for metric, key, cond in STATS_METRICS
+        )
+
+    def counted_key(key, cond, r):
+        # 집계에 들어가는 키 (조건에 안 맞으면 NULL)
+        return f"(CASE WHEN {cond.format(r=r)} THEN {key.format(r=r)} END)"
+
+    changed = " OR ".join(
+        f"{counted_key(key, cond, 'old')} IS NOT {counted_key(key, cond, 'new')}"
+        for _, key, cond in STATS_METRICS
+    )
+    cur.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS writer_tests_stats_insert
+        AFTER INSERT ON writer_tests
+        BEGIN
+            {add("new")}
+        END
+        """
+    )
+    cur.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS writer_tests_stats_update
+        AFTER UPDATE OF status, submitted_at, char_count ON writer_tests
+        WHEN {changed}
+        BEGIN
+            {sub("old")}
+            {add("new")}
+        END
+        """
+    )
+    cur.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS writer_tests_stats_delete
+        AFTER DELETE ON writer_tests
+        BEGIN
+            {sub("old")}
+        END
+        """
+    )
+
+
+@migration(10)
+def migrate_fulltext_external_content(cur):
+    """
+    전문 검색 색인을 external content 방식으로 바꿈 (migration 5 의 색인 대체).
+    - 예전 색인은 본문을 압축 없이 한 벌 더 저장해서 zlib 본문으로 줄인 용량을 도로 늘렸고,
+      unpack_body() 를 부르는 트리거 때문에 그 함수가 없는 연결(sqlite3 CLI 등)에서는
+      writer_test_bodies 에 쓰기만 해도 실패했다.
+    - 이제 색인은 writer_tests_search 뷰(제목 + 압축 푼 본문)를 내용으로 읽고 토큰만 저장.
+      트리거 없이 앱이 직접 동기화한다 (fts_forget / fts_index).
+    - 대가: 검색 결과 강조/짧은 검색어 확인 때 본문을 그때그때 압축 해제하고,
+      앱 밖에서 writer_tests / 본문을 바꾸면 색인이 어긋남 → check_db.py optimize --fts-rebuild
+    """
+    for trigger in (
+        "writer_tests_fts_insert",
+        "writer_tests_fts_title",
+        "writer_tests_fts_delete",
+        "writer_test_bodies_fts_insert",
+        "writer_test_bodies_fts_update",
+    ):
+        cur.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    cur.execute("DROP TABLE IF EXISTS writer_tests_fts")
+    if not fts_trigram_available(cur):
+        return
+
+    cur.execute(
+        """
+        CREATE VIEW IF NOT EXISTS writer_tests_search AS
+        SELECT w.id AS id, w.title AS title, unpack_body(b.body) AS body
+        FROM writer_tests w
+        LEFT JOIN writer_test_bodies b ON b.test_id = w.id
+        """
+    )
+    cur.execute(
+        """
+        CREATE VIRTUAL TABLE writer_tests_fts
+        USING fts5(title, body, content='writer_tests_search', content_rowid='id',
+                   tokenize='trigram')
+        """
+    )
+    cur.execute("INSERT INTO writer_tests_fts (writer_tests_fts) VALUES ('rebuild')")
+
+
+def pack_body(text):
+    """본문 → (zlib 압축 데이터, 압축 전 UTF-8 바이트 수)"""
+    raw = (text or "").encode("utf-8")
+    return zlib.compress(raw), len(raw)
+
+
+def unpack_body(blob):
+    """압축된 본문 → 문자열 (예전 TEXT 그대로 저장된 값도 처리)"""
+    if blob is None:
+        return ""
+    if isinstance(blob, str):
+        return blob
+    return zlib.decompress(blob).decode("utf-8")
+
+
+def load_body(cur, test_id):
+    cur.execute("SELECT body FROM writer_test_bodies WHERE test_id=?", (test_id,))
+    row = cur.fetchone()
+    return unpack_body(row["body"]) if row else ""
+
+
+def store_body(cur, test_id, text):
+    cur.execute(
+        """
+        INSERT INTO writer_test_bodies (test_id, body, body_len) VALUES (?, ?, ?)
+        ON CONFLICT(test_id) DO UPDATE SET body=excluded.body, body_len=excluded.body_len
+        """,
+        (test_id,) + pack_body(text),
+    )
+
+
+# 전문 검색 색인 동기화 (migration 10, 트리거 없이 앱에서 직접)
+# - 색인에서 뺄 때 FTS5 가 뷰의 *현재* 내용을 읽어 토큰을 지우므로
+#   내용이 바뀌거나 행이 지워지기 전에 fts_forget → 바뀐 뒤 fts_index
+# - 색인이 없는 SQLite 빌드면 아무 일도 안 함 (init_db 뒤에 FTS_ENABLED 결정)
+FTS_ENABLED = False
+
+
+def fts_forget(cur, ids):
+    if FTS_ENABLED:
+        # 색인된 적 없는 행(앱 밖에서 넣은 행)을 빼려 하면 없는 토큰을 지우다 색인이 깨지므로
+        # _docsize 에 있는 행만 뺌
+        cur.executemany(
+            """
+            DELETE FROM writer_tests_fts
+            WHERE rowid = ? AND EXISTS (SELECT 1 FROM writer_tests_fts_docsize WHERE id = ?)
+            """,
+            [(i, i) for i in ids],
+        )
+
+
+def fts_index(cur, test_id, title, body):
+    if FTS_ENABLED:
+        cur.execute(
+            "INSERT INTO writer_tests_fts (rowid, title, body) VALUES (?, ?, ?)",
+            (test_id, title or "", body or ""),
+        )
+
+
+def fts_clear(cur):
+    if FTS_ENABLED:
+        cur.execute("INSERT INTO writer_tests_fts (writer_tests_fts) VALUES ('delete-all')")
+
+
+def identity_key(name, birth_year, phone_last4):
+    """
+    지원자 식별 키 (이름 + 출생연도 + 휴대폰 뒷자리 → 해시).
+    - 이름: 유니코드 정규화(NFKC) 후 공백 제거, 소문자화
+    - 출생연도/뒷자리: 숫자만 사용
+    """
+    norm_name = "".join(unicodedata.normalize("NFKC", name or "").split()).casefold()
+    norm_birth = "".join(ch for ch in (birth_year or "") if ch.isdigit())
+    norm_phone = "".join(ch for ch in (phone_last4 or "") if ch.isdigit())
+    raw = f"{norm_name}|{norm_birth}|{norm_phone}"
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+# ─────────────────────────
+# 워커 간 공유 버전 카운터 (mmap)
+# ─────────────────────────
+# - DB 옆의 작은 파일(DB_PATH + "-versions")을 모든 gunicorn 워커가 mmap 으로 공유.
+# - 값이 바뀌는 쪽(set_test_open 등)이 DB 커밋 후 슬롯 번호의 카운터를 올리고,
+#   읽는 쪽은 메모리에서 8바이트만 비교해 캐시가 아직 유효한지 판단한다.
+VERSION_FILE = DB_PATH + "-versions"
+VERSION_SLOT_TEST_OPEN = 0
+VERSION_SLOT_BLACKLIST = 1
+VERSION_SLOT_COUNT = 16
+
+
+class SharedVersions:
+    def __init__(self, path, slots):
+        self.path = path
+        self.size = slots * 8
+        self._map = None
+        self._pid = None
+
+    def _buf(self):
+        if self._map is None or self._pid != os.getpid():
+            with open(self.path, "a+b") as f:
+                if os.path.getsize(self.path) < self.size:
+                    f.truncate(self.size)
+                self._map = mmap.mmap(f.fileno(), self.size)
+            self._pid = os.getpid()
+        return self._map
+
+    def get(self, slot):
+        return struct.unpack_from("<Q", self._buf(), slot * 8)[0]
+
+    def bump(self, slot):
+        # 여러 워커가 동시에 올려도 값이 "바뀌기만" 하면 되므로 잠금 없이
+        # (이전값 + 1)과 현재 시각(ns) 중 큰 값을 기록
+        buf = self._buf()
+        current = struct.unpack_from("<Q", buf, slot * 8)[0]
+        struct.pack_into("<Q", buf, slot * 8, max(current + 1, time.time_ns()))
+
+
+shared_versions = SharedVersions(VERSION_FILE, VERSION_SLOT_COUNT)
+
+# (버전, test_open 값) — 버전이 같으면 DB를 읽지 않고 그대로 사용
+_test_open_cache = None
+
+# (버전, 블랙리스트 identity_key 집합)
+_blacklist_cache = None
+
+
+def get_blacklist_keys():
+    """
+    블랙리스트 identity_key 집합 (워커 메모리 캐시).
+    - blacklist_add / blacklist_remove 가 공유 버전을 올렸을 때만 다시 읽는다.
+    """
+    global _blacklist_cache
+    version = shared_versions.get(VERSION_SLOT_BLACKLIST)
+    cached = _blacklist_cache
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    conn = get_db()
+    cur = conn.cursor()
+    cur.execute("SELECT identity_key FROM blacklist")
+    keys = frozenset(r["identity_key"] for r in cur)
+    _blacklist_cache = (version, keys)
+    return keys
+
+
+def is_blacklisted(key):
+    return key in get_blacklist_keys()
+
+
+def get_test_open():
+    """
+    TEST 오픈 여부 (워커 메모리 캐시).
+    - 공유 버전 카운터가 바뀌었을 때만 config 테이블을 다시 읽는다.
+    """
+    global _test_open_cache
+    # 버전을 먼저 읽고 DB를 읽어야, 그 사이에 바뀐 값도 다음 호출에서 다시 읽힘
+    version = shared_versions.get(VERSION_SLOT_TEST_OPEN)
+    cached = _test_open_cache
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    conn = get_db()
+    cur = conn.cursor()
+    cur.execute("SELECT value FROM config WHERE key='test_open'")
+    row = cur.fetchone()
+    value = True if not row else row["value"] == "1"
+    _test_open_cache = (version, value)
+    return value
+
+
+def set_test_open(flag: bool):
+    conn = get_db()
+    cur = conn.cursor()
+    cur.execute(
+        "INSERT INTO config (key, value) VALUES (?, ?) "
+        "ON CONFLICT(key) DO UPDATE SET value=excluded.value",
+        ("test_open", "1" if flag else "0"),
+    )
+    conn.commit()
+    # 커밋 이후에 버전을 올려야 다른 워커가 새 값을 읽는다
+    shared_versions.bump(VERSION_SLOT_TEST_OPEN)
+
+# CSV 백업에 들어가는 컬럼 (순서 그대로 헤더가 됨)
+EXPORT_COLUMNS = (
+    "id", "name", "birth_year", "phone_last4", "title", "body", "char_count",
+    "status", "created_at", "submitted_at", "deadline_at",
+)
+EXPORT_BATCH_SIZE = 200
+
+
+def iter_csv_rows(cur):
+    """
+    EXPORT_COLUMNS 순서로 SELECT 한 커서 → CSV 조각을 조금씩 생성 (fetchmany 단위).
+    - 본문이 길고 행이 많아도 메모리에는 EXPORT_BATCH_SIZE 행만 올라감
+    """
+    output = StringIO()
+    writer = csv.writer(output)
+    body_index = EXPORT_COLUMNS.index("body")
+
+    # 헤더
+    writer.writerow(EXPORT_COLUMNS)
+    yield output.getvalue()
+
+    # 데이터 (본문은 압축 해제)
+    while True:
+        rows = cur.fetchmany(EXPORT_BATCH_SIZE)
+        if not rows:
+            break
+        output.seek(0)
+        output.truncate()
+        for r in rows:
+            values = list(r)
+            values[body_index] = unpack_body(values[body_index])
+            writer.writerow(values)
+        yield output.getvalue()
+
+
+# ─────────────────────────
+# 회차(round) 보관: 마감된 회차는 별도 DB 파일로
+# ─────────────────────────
+# - 회차 마감 = writer_tests 행을 ROUNDS_DIR/<이름>.db 로 복사 → 원본은 조금씩 삭제.
+#   · 복사: ATTACH 한 회차 DB 에만 쓰는 트랜잭션 (본 DB 는 읽기만 → 응시자 쓰기를 막지 않음)
+#   · 삭제: ROUND_DELETE_BATCH 행씩 짧은 트랜잭션 여러 번 (큰 DELETE 로 잠그지 않음)
+#   · 복사 뒤에 바뀐 행(change_rev 증가)은 지우지 않고 다시 복사해서 최신 상태를 보관
+#   · 두 DB 를 한 트랜잭션으로 묶지 않으므로, 중간에 죽으면 "양쪽에 다 있는" 상태만 생김
+#     → 같은 이름으로 다시 마감하면 이어서 진행
+# - 마감된 회차 DB 는 읽기 전용(mode=ro)으로 따로 열어서 조회 → 현재 TEST 연결/잠금과 무관
+ROUNDS_DIR = os.environ.get("ROUNDS_DIR") or os.path.join(os.path.dirname(DB_PATH), "rounds")
+ROUND_DELETE_BATCH = 500
+ROUND_NAME_RE = re.compile(r"^[0-9A-Za-z][0-9A-Za-z._-]{0,39}$")
+
+# 회차 DB 의 writer_tests: 본문(압축)까지 한 행에
+ROUND_COLUMNS = (
+    "id", "name", "birth_year", "phone_last4", "identity_key", "title", "body", "char_count",
+    "status", "created_at", "submitted_at", "deadline_at", "draft_rev",
+)
+
+
+def round_path(file):
+    return os.path.join(ROUNDS_DIR, file)
+
+
+def default_round_name(cur):
+    """기본 회차 이름: YYYY-MM (이미 있으면 YYYY-MM-2, -3 ...)"""
+    base = datetime.now().strftime("%Y-%m")
+    name = base
+    n = 1
+    while cur.execute("SELECT 1 FROM rounds WHERE name=?", (name,)).fetchone():
+        n += 1
+        name = f"{base}-{n}"
+    return name
+
+
+def close_round(name=None):
+    """
+    현재 writer_tests 전체를 회차 DB 로 옮기고 rounds 행을 반환.
+    - name 이 없으면 default_round_name (진행 중인 회차가 있으면 그것을 이어서 마감)
+    - 이미 마감된 이름이면 ValueError("exists"), 다른 회차를 옮기는 중이면 ValueError("in_progress")
+    """
+    conn = get_db()
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    with write_transaction(conn):
+        pending = conn.execute("SELECT * FROM rounds WHERE status='copying'").fetchone()
+        if pending is not None and name not in (None, pending["name"]):
+            raise ValueError("in_progress")
+        if pending is not None:
+            name = pending["name"]
+        else:
+            name = name or default_round_name(conn.cursor())
+            if conn.execute("SELECT 1 FROM rounds WHERE name=?", (name,)).fetchone():
+                raise ValueError("exists")
+            max_id = conn.execute("SELECT MAX(id) AS m FROM writer_tests").fetchone()["m"] or 0
+            conn.execute(
+                "INSERT INTO rounds (name, file, status, max_id, started_at) "
+                "VALUES (?, ?, 'copying', ?, ?)",
+                (name, f"{name}.db", max_id, now),
+            )
+        rnd = conn.execute("SELECT * FROM rounds WHERE name=?", (name,)).fetchone()
+
+    os.makedirs(ROUNDS_DIR, exist_ok=True)
+    # ATTACH/DETACH 는 트랜잭션 밖에서만 가능
+    if conn.in_transaction:
+        conn.commit()
+    conn.execute("ATTACH DATABASE ? AS round_db", (round_path(rnd["file"]),))
+    try:
+        conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS round_db.writer_tests (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                birth_year TEXT NOT NULL,
+                phone_last4 TEXT NOT NULL,
+                identity_key TEXT,
+                title TEXT,
+                body BLOB,
+                char_count INTEGER DEFAULT 0,
+                status TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                submitted_at TEXT,
+                deadline_at TEXT NOT NULL,
+                draft_rev INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS round_db.idx_round_status ON writer_tests (status, id)"
+        )
+
+        select_columns = ", ".join("b.body" if c == "body" else f"w.{c}" for c in ROUND_COLUMNS)
+        copied_rev = -1
+        for _ in range(10):
+            # 1) 복사: 회차 DB 에만 쓰는 트랜잭션 (본 DB 는 스냅샷 읽기)
+            conn.execute("BEGIN")
+            try:
+                new_rev = current_change_rev(conn.cursor())
+                conn.execute(
+                    f"""
+                    INSERT OR REPLACE INTO round_db.writer_tests ({", ".join(ROUND_COLUMNS)})
+                    SELECT {select_columns}
+                    FROM main.writer_tests w
+                    LEFT JOIN main.writer_test_bodies b ON b.test_id = w.id
+                    WHERE w.id <= ? AND w.change_rev > ?
+                    """,
+                    (rnd["max_id"], copied_rev),
+                )
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+            copied_rev = new_rev
+
+            # 2) 삭제: 복사 이후 바뀌지 않은 행만 조금씩
+            while True:
+                with write_transaction(conn):
+                    ids = [
+                        (r["id"],)
+                        for r in conn.execute(
+                            "SELECT id FROM main.writer_tests WHERE id <= ? AND change_rev <= ? "
+                            "LIMIT ?",
+                            (rnd["max_id"], copied_rev, ROUND_DELETE_BATCH),
+                        )
+                    ]
+                    fts_forget(conn, [i for (i,) in ids])
+                    conn.executemany("DELETE FROM main.writer_tests WHERE id=?", ids)
+                if len(ids) < ROUND_DELETE_BATCH:
+                    break
+
+            left = conn.execute(
+                "SELECT COUNT(*) AS c FROM main.writer_tests WHERE id <= ?", (rnd["max_id"],)
+            ).fetchone()["c"]
+            if not left:
+                break
+        else:
+            raise RuntimeError(f"round {name}: rows keep changing, try again")
+
+        with write_transaction(conn):
+            stats = conn.execute(
+                "SELECT COUNT(*) AS c, MIN(id) AS lo, MAX(id) AS hi FROM round_db.writer_tests"
+            ).fetchone()
+            conn.execute(
+                "UPDATE rounds SET status='closed', row_count=?, min_id=?, max_id=?, closed_at=? "
+                "WHERE name=?",
+                (stats["c"], stats["lo"], stats["hi"] or rnd["max_id"], now, name),
+            )
+    finally:
+        if conn.in_transaction:
+            conn.rollback()
+        conn.execute("DETACH DATABASE round_db")
+
+    return conn.execute("SELECT * FROM rounds WHERE name=?", (name,)).fetchone()
+
+
+@contextmanager
+def open_round_db(file):
+    """마감된 회차 DB 를 읽기 전용으로 열기 (요청 하나 동안만)"""
+    uri = "file:" + quote(os.path.abspath(round_path(file))) + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, factory=TimedConnection)
+    conn.metrics_role = "round"
+    conn.row_factory = sqlite3.Row
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def find_round_test(cur, test_id):
+    """
+    id 로 회차 DB 에서 행 찾기 → (회차 이름, 행) 또는 (None, None).
+    - rounds 의 id 범위로 회차를 고른 뒤 그 파일만 연다.
+    """
+    cur.execute(
+        "SELECT name, file FROM rounds WHERE status='closed' AND min_id <= ? AND max_id >= ?",
+        (test_id, test_id),
+    )
+    for rnd in cur.fetchall():
+        try:
+            with open_round_db(rnd["file"]) as rconn:
+                row = rconn.execute(
+                    f"SELECT {', '.join(ROUND_COLUMNS)} FROM writer_tests WHERE id=?", (test_id,)
+                ).fetchone()
+        except sqlite3.Error:
+            continue
+        if row is not None:
+            return rnd["name"], row
+    return None, None
+
+
+def reset_writer_tests():
+    """
+    writer_tests 내용만 모두 삭제 (DB 파일 삭제 X, 구조 유지)
+    - test 진행 중에는 호출하면 안 되며,
+      반드시 test_open 이 0(종료)일 때만 사용해야 함.
+    """
+    with write_transaction() as conn:
+        cur = conn.cursor()
+        fts_clear(cur)
+        cur.execute("DELETE FROM writer_tests")
+
+
+# ─────────────────────────
+# 백그라운드 작업 큐 (jobs 테이블)
+# ─────────────────────────
+# - enqueue_job() 으로 호출한 쪽 트랜잭션 안에서 jobs 행을 넣고, 커밋 후 notify_jobs().
+# - 워커 프로세스마다 JOB_WORKERS 개의 스레드가 jobs 를 하나씩 가져가 실행.
+# - 서버가 재시작되어도 jobs 행은 남아 있으므로 다시 실행됨
+#   (running 상태로 JOB_STALE_SECONDS 이상 지난 작업은 다시 가져감).
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "2"))
+JOB_POLL_SECONDS = float(os.environ.get("JOB_POLL_SECONDS", "1.0"))
+JOB_STALE_SECONDS = int(os.environ.get("JOB_STALE_SECONDS", "300"))
+JOB_RETRY_BASE_SECONDS = 5
+
+JOB_HANDLERS = {}
+
+logger = logging.getLogger(__name__)
+
+
+def job_handler(kind):
+    """작업 종류별 처리 함수 등록. 처리 함수는 payload(dict)를 받아 결과(dict)를 반환."""
+    def decorator(f):
+        JOB_HANDLERS[kind] = f
+        return f
+    return decorator
+
+
+def enqueue_job(cur, kind, payload=None, test_id=None, max_attempts=3):
+    """
+    작업 추가 (호출한 쪽 트랜잭션에 포함됨 → 커밋되어야 실행).
+    - 커밋 후 notify_jobs() 를 부르면 같은 프로세스의 워커가 바로 깨어남
+    """
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    cur.execute(
+        """
+        INSERT INTO jobs (kind, test_id, payload, max_attempts, run_after, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        (kind, test_id, json.dumps(payload or {}), max_attempts, now, now, now),
+    )
+    return cur.lastrowid
+
+
+class JobWorkerPool:
+    def __init__(self, size):
+        self.size = size
+        self.wakeup = threading.Event()
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def ensure_started(self):
+        # gunicorn 워커마다 한 번 (fork 이후 프로세스 기준)
+        if self.size <= 0 or self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self.wakeup = threading.Event()
+            for i in range(self.size):
+                name = f"job-worker-{os.getpid()}-{i}"
+                threading.Thread(target=self._run, name=name, daemon=True).start()
+
+    def notify(self):
+        self.wakeup.set()
+
+    def _claim(self, worker_name):
+        conn = get_db()
+        now = datetime.now()
+        now_str = now.strftime("%Y-%m-%d %H:%M:%S")
+        stale_str = (now - timedelta(seconds=JOB_STALE_SECONDS)).strftime("%Y-%m-%d %H:%M:%S")
+        # running 인데 locked_at 이 오래된 작업 = 처리 중 워커가 죽었거나 완료 기록에 실패한 작업
+        claim_sql = """
+            SELECT id, kind, payload, status, attempts, max_attempts FROM jobs
+            WHERE (status='queued' AND run_after <= ?)
+               OR (status='running' AND locked_at < ?)
+            ORDER BY id
+            LIMIT 1
+        """
+
+        # 잠금 없이 먼저 확인 → 할 일이 있을 때만 쓰기 잠금
+        if conn.execute(claim_sql, (now_str, stale_str)).fetchone() is None:
+            return None
+
+        with write_transaction(conn):
+            row = conn.execute(claim_sql, (now_str, stale_str)).fetchone()
+            if row is None:
+                return None
+            if row["status"] == "running" and row["attempts"] >= row["max_attempts"]:
+                # 시도 횟수를 다 쓴 작업은 다시 돌리지 않고 실패 처리
+                conn.execute(
+                    """
+                    UPDATE jobs
+                    SET status='failed', last_error=?, locked_by=NULL, updated_at=?
+                    WHERE id=?
+                    """,
+                    ("stale: worker lost while running", now_str, row["id"]),
+                )
+                logger.warning("job %s (%s) stale after %s attempts, marked failed",
+                               row["id"], row["kind"], row["attempts"])
+                return None
+            conn.execute(
+                """
+                UPDATE jobs
+                SET status='running', attempts=attempts+1, locked_by=?, locked_at=?, updated_at=?
+                WHERE id=?
+                """,
+                (worker_name, now_str, now_str, row["id"]),
+            )
+        return row
+
+    def _finish(self, job_id, result=None, error=None):
+        conn = get_db()
+        now = datetime.now()
+        now_str = now.strftime("%Y-%m-%d %H:%M:%S")
+        with write_transaction(conn):
+            if error is None:
+                conn.execute(
+                    """
+                    UPDATE jobs
+                    SET status='done', result=?, last_error=NULL, locked_by=NULL, updated_at=?
+                    WHERE id=?
+                    """,
+                    (json.dumps(result, ensure_ascii=False), now_str, job_id),
+                )
+                return
+
+            row = conn.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE id=?", (job_id,)
+            ).fetchone()
+            if row is None:
+                return
+            if row["attempts"] >= row["max_attempts"]:
+                status, run_after = "failed", now_str
+            else:
+                # 재시도: 5초, 10초, 20초 ... 뒤에 다시
+                delay = JOB_RETRY_BASE_SECONDS * (2 ** (row["attempts"] - 1))
+                status = "queued"
+                run_after = (now + timedelta(seconds=delay)).strftime("%Y-%m-%d %H:%M:%S")
+            conn.execute(
+                """
+                UPDATE jobs
+                SET status=?, run_after=?, last_error=?, locked_by=NULL, updated_at=?
+                WHERE id=?
+                """,
+                (status, run_after, error, now_str, job_id),
+            )
+
+    def _run(self):
+        worker_name = threading.current_thread().name
+        while True:
+            try:
+                job = self._claim(worker_name)
+            except sqlite3.Error:
+                logger.exception("job claim failed")
+                job = None
+
+            if job is None:
+                self.wakeup.wait(JOB_POLL_SECONDS)
+                self.wakeup.clear()
+                continue
+
+            handler = JOB_HANDLERS.get(job["kind"])
+            try:
+                if handler is None:
+                    raise LookupError(f"unknown job kind: {job['kind']}")
+                result = handler(json.loads(job["payload"] or "{}"))
+            except Exception:
+                logger.exception("job %s (%s) failed", job["id"], job["kind"])
+                metrics.inc("writer_test_jobs_total", kind=job["kind"], result="error")
+                outcome = {"error": traceback.format_exc(limit=5)}
+            else:
+                metrics.inc("writer_test_jobs_total", kind=job["kind"], result="done")
+                outcome = {"result": result}
+
+            # 완료 기록이 실패해도 (database is locked 등) 워커 스레드는 살아 있어야 함
+            # → 작업은 running 으로 남고 JOB_STALE_SECONDS 뒤 _claim 이 다시 가져감
+            try:
+                self._finish(job["id"], **outcome)
+            except Exception:
+                logger.exception("job %s (%s) finish failed", job["id"], job["kind"])
+            try:
+                metrics.flush()
+            except Exception:
+                logger.exception("metrics flush failed")
+
+
+job_pool = JobWorkerPool(JOB_WORKERS)
+
+
+def notify_jobs():
+    job_pool.notify()
+
+
+@app.before_request
+def start_job_workers():
+    # import 시점이 아니라 첫 요청 때 시작 (gunicorn --preload 의 fork 이후)
+    job_pool.ensure_started()
+
+
+@job_handler("text_stats")
+def job_text_stats(payload):
+    """제출 본문 통계 (문단/문장 수, 평균 문장 길이 등)"""
+    test_id = payload["testId"]
+    cur = get_db().cursor()
+    cur.execute("SELECT id FROM writer_tests WHERE id=?", (test_id,))
+    if cur.fetchone() is None:
+        return {"testId": test_id, "missing": True}
+
+    body = load_body(cur, test_id)
+    paragraphs = [p for p in re.split(r"\n\s*\n", body) if p.strip()]
+    sentences = [x for x in re.split(r"(?<=[.!?])\s+|\n+", body) if x.strip()]
+    sentence_lengths = [non_ws_length(x) for x in sentences]
+    return {
+        "testId": test_id,
+        "chars": len(body),
+        "nonWsChars": non_ws_length(body),
+        "lines": body.count("\n") + 1 if body else 0,
+        "paragraphs": len(paragraphs),
+        "sentences": len(sentences),
+        "avgSentenceLength": (
+            round(sum(sentence_lengths) / len(sentence_lengths), 1) if sentence_lengths else 0
+        ),
+        "maxSentenceLength": max(sentence_lengths, default=0),
+    }
+
+
+# ─────────────────────────
+# 유사 제출 탐지 (MinHash / LSH)
+# ─────────────────────────
+# - 본문(공백 제거)을 글자 SHINGLE_SIZE-gram 으로 쪼개 MinHash 서명(MINHASH_PERMUTATIONS 개)을 만든다.
+# - 서명을 LSH_BANDS 개 밴드로 나눠 밴드별 해시(bucket)를 인덱스에 저장 →
+#   같은 bucket 을 하나라도 공유하는 제출만 후보로 비교 (전체 쌍 비교 X).
+SHINGLE_SIZE = 5
+MINHASH_PERMUTATIONS = 128
+LSH_BANDS = 32
+LSH_ROWS = MINHASH_PERMUTATIONS // LSH_BANDS
+_MINHASH_PRIME = (1 << 61) - 1
+_minhash_rng = random.Random(20240601)  # 서명이 DB에 저장되므로 계수는 항상 같아야 함
+MINHASH_COEFFS = [
+    (_minhash_rng.randrange(1, _MINHASH_PRIME), _minhash_rng.randrange(0, _MINHASH_PRIME))
+    for _ in range(MINHASH_PERMUTATIONS)
+]
+_SIGNATURE_FORMAT = f"<{MINHASH_PERMUTATIONS}I"
+
+
+def minhash_signature(text):
+    """본문 → (MinHash 서명 tuple, shingle 수). 본문이 비어 있으면 (None, 0)"""
+    norm = "".join(unicodedata.normalize("NFKC", text or "").split())
+    if not norm:
+        return None, 0
+    if len(norm) < SHINGLE_SIZE:
+        shingles = {norm}
+    else:
+        shingles = {norm[i:i + SHINGLE_SIZE] for i in range(len(norm) - SHINGLE_SIZE + 1)}
+    hashes = [zlib.crc32(sh.encode("utf-8")) for sh in shingles]
+    signature = tuple(
+        min((a * x + b) % _MINHASH_PRIME for x in hashes) & 0xFFFFFFFF
+        for a, b in MINHASH_COEFFS
+    )
+    return signature, len(shingles)
+
+
+def lsh_buckets(signature):
+    """서명 → [(band, bucket), ...]"""
+    packed = struct.pack(_SIGNATURE_FORMAT, *signature)
+    step = LSH_ROWS * 4
+    return [
+        (band, zlib.crc32(packed[band * step:(band + 1) * step]))
+        for band in range(LSH_BANDS)
+    ]
+
+
+def signature_similarity(sig_a, sig_b):
+    """추정 Jaccard 유사도 (서명 값이 같은 비율)"""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / MINHASH_PERMUTATIONS
+
+
+def load_any_body(cur, test_id):
+    """현재 TEST → 마감된 회차 DB → 예전 보관 테이블 순으로 본문을 찾음. 없으면 None"""
+    cur.execute("SELECT 1 FROM writer_tests WHERE id=?", (test_id,))
+    if cur.fetchone():
+        return load_body(cur, test_id)
+    _, round_row = find_round_test(cur, test_id)
+    if round_row is not None:
+        return unpack_body(round_row["body"])
+    cur.execute(
+        "SELECT body FROM writer_tests_archive WHERE id=? ORDER BY archived_at DESC LIMIT 1",
+        (test_id,),
+    )
+    row = cur.fetchone()
+    return unpack_body(row["body"]) if row else None
+
+
+def find_similar_tests(cur, test_id, limit=5, min_score=0.3):
+    """
+    test_id 와 비슷한 제출 목록 [(다른 test_id, 유사도), ...] (유사도 높은 순)
+    - 저장된 서명이 없으면(임시저장 상태 등) 현재 본문으로 즉석 계산
+    """
+    cur.execute("SELECT signature FROM minhash_signatures WHERE test_id=?", (test_id,))
+    row = cur.fetchone()
+    if row:
+        signature = struct.unpack(_SIGNATURE_FORMAT, row["signature"])
+    else:
+        signature, _ = minhash_signature(load_any_body(cur, test_id))
+    if signature is None:
+        return []
+
+    buckets = lsh_buckets(signature)
+    values_sql = ", ".join("(?, ?)" for _ in buckets)
+    cur.execute(
+        f"""
+        SELECT DISTINCT s.test_id, s.signature
+        FROM (VALUES {values_sql}) AS q
+        JOIN minhash_bands mb ON mb.band = q.column1 AND mb.bucket = q.column2
+        JOIN minhash_signatures s ON s.test_id = mb.test_id
+        WHERE mb.test_id != ?
+        """,
+        [v for pair in buckets for v in pair] + [test_id],
+    )
+    scored = []
+    for r in cur.fetchall():
+        score = signature_similarity(signature, struct.unpack(_SIGNATURE_FORMAT, r["signature"]))
+        if score >= min_score:
+            scored.append((r["test_id"], score))
+    scored.sort(key=lambda x: (-x[1], -x[0]))
+    return scored[:limit]
+
+
+@job_handler("minhash")
+def job_minhash(payload):
+    """제출 본문의 MinHash 서명 + LSH 밴드 저장 (다시 제출하면 덮어씀)"""
+    test_id = payload["testId"]
+    conn = get_db()
+    cur = conn.cursor()
+    body = load_any_body(cur, test_id)
+    if body is None:
+        return {"testId": test_id, "missing": True}
+
+    signature, shingle_count = minhash_signature(body)
+    with write_transaction(conn):
+        cur.execute("DELETE FROM minhash_signatures WHERE test_id=?", (test_id,))
+        cur.execute("DELETE FROM minhash_bands WHERE test_id=?", (test_id,))
+        if signature is not None:
+            cur.execute(
+                """
+                INSERT INTO minhash_signatures (test_id, signature, shingle_count, created_at)
+                VALUES (?, ?, ?, ?)
+                """,
+                (
+                    test_id,
+                    struct.pack(_SIGNATURE_FORMAT, *signature),
+                    shingle_count,
+                    datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                ),
+            )
+            cur.executemany(
+                "INSERT OR IGNORE INTO minhash_bands (band, bucket, test_id) VALUES (?, ?, ?)",
+                [(band, bucket, test_id) for band, bucket in lsh_buckets(signature)],
+            )
+    return {"testId": test_id, "shingles": shingle_count}
+
+
+# 제출 직후 비동기로 돌릴 작업 목록
+POST_SUBMIT_JOBS = ("text_stats", "minhash")
+
+
+# ─────────────────────────
+# 조건부 GET (ETag / 304)
+# ─────────────────────────
+# - 검증값(ETag)은 행의 change_rev, 전역 change_seq, 공유 버전 카운터처럼
+#   값이 바뀔 때만 달라지는 번호로 만든다.
+# - If-None-Match 가 같으면 본문 조회/직렬화 없이 304 만 돌려준다.
+# - no-cache: 브라우저는 저장해 두되 매번 서버에 재검증 (fetch 는 304 를 캐시 본문으로 대체)
+def conditional_response(etag, build):
+    """
+    etag 가 요청의 If-None-Match 와 같으면 304, 아니면 build() 결과에 ETag 를 붙여 반환.
+    - build: 실제 응답을 만드는 함수 (바뀐 경우에만 호출)
+    """
+    if request.if_none_match.contains_weak(etag):
+        resp = Response(status=304)
+    else:
+        resp = make_response(build())
+        if resp.status_code != 200:
+            return resp
+    resp.set_etag(etag, weak=True)
+    resp.headers["Cache-Control"] = "private, no-cache"
+    return resp
+
+
+def query_etag(prefix, *parts):
+    """검증값 조각 + 쿼리스트링 → ETag 문자열 (필터/정렬이 다르면 다른 값)"""
+    raw = "|".join(str(p) for p in parts) + "|" + request.query_string.decode("latin-1")
+    return prefix + "-" + hashlib.blake2b(raw.encode("utf-8"), digest_size=8).hexdigest()
+
+
+# ─────────────────────────
+# 쓰기 요청 제한 (token bucket + 동시 처리 상한)
+# ─────────────────────────
+# - 응시자 API (register / draft / save_draft / submit) 에만 적용 (관리자 API 는 제외)
+# - IP 별 버킷 → 동시 처리 상한 → (JSON 파싱 후) testId/지원자 별 버킷 순서로 검사
+#   · 싼 검사를 먼저 해서 과한 요청은 본문 파싱/DB 쓰기 전에 걸러냄
+# - 넘치면 429 + Retry-After (초). 응시자 화면은 다음 자동 저장 때 다시 시도한다.
+# - 버킷은 워커 프로세스 메모리 기준 (gunicorn 워커 수만큼 전체 허용량이 늘어남)
+# - IP 는 request.remote_addr. 프록시 뒤에서는 ProxyFix 가 X-Forwarded-For 중
+#   믿을 수 있는 프록시(TRUSTED_PROXY_COUNT 단)가 붙인 값만 반영하므로 클라이언트가 위조할 수 없음.
+# - WRITE_RATE_LIMIT=0 이면 버킷 검사는 끄고 동시 처리 상한만 유지 (부하 테스트용)
+WRITE_RATE_LIMIT = os.environ.get("WRITE_RATE_LIMIT", "1") != "0"
+WRITE_IP_RATE = float(os.environ.get("WRITE_IP_RATE", "20"))  # 초당 토큰
+WRITE_IP_BURST = float(os.environ.get("WRITE_IP_BURST", "60"))
+WRITE_MAX_CONCURRENCY = int(os.environ.get("WRITE_MAX_CONCURRENCY", "16"))
+WRITE_QUEUE_TIMEOUT = float(os.environ.get("WRITE_QUEUE_TIMEOUT", "2"))
+
+# 엔드포인트 → (초당 토큰, 최대 누적) : testId / 지원자 식별키 기준
+WRITE_KEY_LIMITS = {
+    "register": (0.2, 3),  # 5초에 1번, 연속 3번까지
+    "save_draft": (1, 5),
+    "submit": (0.2, 3),
+    "draft_state": (1, 5),
+}
+
+
+class TokenBucketLimiter:
+    def __init__(self, rate, burst, max_keys=50000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # key → (남은 토큰, 마지막 갱신 시각), 오래 안 쓴 순
+        self._lock = threading.Lock()
+
+    def take(self, key):
+        """
+        토큰 1개 사용. 허용이면 0, 아니면 다시 시도까지 기다려야 하는 초.
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            wait = 0 if tokens >= 1 else (1 - tokens) / self.rate
+            self._buckets[key] = (tokens - 1 if tokens >= 1 else tokens, now)
+            self._buckets.move_to_end(key)
+            # 키 수 상한: 가장 오래 안 쓴 키부터 버림 (다시 오면 가득 찬 상태로 시작)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return wait
+
+
+_write_ip_limiter = TokenBucketLimiter(WRITE_IP_RATE, WRITE_IP_BURST)
+_write_key_limiters = {
+    name: TokenBucketLimiter(rate, burst) for name, (rate, burst) in WRITE_KEY_LIMITS.items()
+}
+_write_slots = threading.BoundedSemaphore(WRITE_MAX_CONCURRENCY)
+
+
+def client_ip():
+    # X-Forwarded-For 는 ProxyFix 가 믿을 수 있는 홉만 반영해 remote_addr 로 넘겨 줌
+    return request.remote_addr or ""
+
+
+def too_many_requests(reason, retry_after):
+    resp = jsonify({"ok": False, "reason": reason})
+    resp.status_code = 429
+    resp.headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+    return resp
+
+
+def write_rate_key(endpoint, data):
+    """
+    요청 본문 → 지원자 단위 제한 키 (register 는 식별키, 나머지는 testId).
+    - testId 가 없거나 잘못되면 None → 지원자별 버킷은 건너뜀
+      (한 키로 모이면 잘못된 요청 하나가 다른 잘못된 요청까지 막음. 어차피 핸들러가 400 으로 거절)
+    """
+    if endpoint == "register":
+        return identity_key(
+            str(data.get("name") or ""),
+            str(data.get("birthYear") or ""),
+            str(data.get("phoneLast4") or ""),
+        )
+    test_id = parse_test_id(data.get("testId"))
+    return str(test_id) if test_id else None
+
+
+def write_limited(endpoint):
+    def reject(reason, retry_after, scope):
+        metrics.inc("writer_test_write_rejected_total", endpoint=endpoint, reason=reason, scope=scope)
+        return too_many_requests(reason, retry_after)
+
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            if WRITE_RATE_LIMIT:
+                wait = _write_ip_limiter.take(client_ip())
+                if wait:
+                    return reject("rate_limited", wait, "ip")
+
+            if not _write_slots.acquire(timeout=WRITE_QUEUE_TIMEOUT):
+                return reject("busy", 1, "global")
+            try:
+                data = request.get_json(force=True, silent=True)
+                key = write_rate_key(endpoint, data) if isinstance(data, dict) else None
+                if WRITE_RATE_LIMIT and key is not None:
+                    wait = _write_key_limiters[endpoint].take(key)
+                    if wait:
+                        return reject("rate_limited", wait, "applicant")
+                # 본문 파싱 결과는 request 에 캐시되므로 f 안의 get_json 은 다시 파싱하지 않음
+                return f(*args, **kwargs)
+            finally:
+                _write_slots.release()
+        return wrapper
+    return decorator
+
+
+# ─────────────────────────
+# 1) 관리자/응시 공통: TEST 오픈 상태
+# ─────────────────────────
+@app.route("/api/writer-test/config", methods=["GET"])
+def api_config():
+    version = shared_versions.get(VERSION_SLOT_TEST_OPEN)
+    test_open = get_test_open()
+    return conditional_response(
+        f"config-{version}-{int(test_open)}",
+        lambda: jsonify({"test_open": test_open}),
+    )
+
+
+@app.route("/api/writer-test/set_open_flag", methods=["POST"])
+@require_admin
+def api_set_open_flag():
+    data = request.get_json(force=True)
+    flag = bool(data.get("test_open", True))
+    set_test_open(flag)
+    return jsonify({"ok": True, "test_open": flag})
+
+
+# ─────────────────────────
+# 2) 응시자: TEST 시작 전 등록 (이름/연도/뒷자리)
+# ─────────────────────────
+@app.route("/api/writer-test/register", methods=["POST"])
+@write_limited("register")
 def api_register():
     """
     지원자 정보 입력 후 TEST 시작할 때 호출.
@@ -265,6 +2264,7 @@ def api_register():
     - 없으면 새 row 생성 후 test_id 리턴
     """
     if not get_test_open():
+        metrics.inc("writer_test_register_total", result="closed")
         return jsonify({"ok": False, "reason": "closed"}), 400
 
     data = request.get_json(force=True)
@@ -273,9 +2273,12 @@ def api_register():
     phone_last4 = (data.get("phoneLast4") or "").strip()
 
     if not (name and birth_year and phone_last4):
+        metrics.inc("writer_test_register_total", result="invalid_input")
         return jsonify({"ok": False, "reason": "invalid_input"}), 400
 
-    if is_blacklisted(name, birth_year, phone_last4):
+    key = identity_key(name, birth_year, phone_last4)
+    if is_blacklisted(key):
+        metrics.inc("writer_test_register_total", result="blacklisted")
         return jsonify({"ok": False, "reason": "blacklisted"}), 403
 
     # 단순 현재 시각(서버 시간)만 기록, 타이머 로직 제거
@@ -287,19 +2290,21 @@ def api_register():
     # 동일인 기존 기록이 있으면 그걸 사용 (임시저장/반려 후 이어쓰기)
     cur.execute(
         """
-        SELECT id, title, body, char_count, created_at, submitted_at, deadline_at, status
+        SELECT id, title, char_count, created_at, submitted_at, deadline_at, status,
+               draft_rev
         FROM writer_tests
-        WHERE name=? AND birth_year=? AND phone_last4=?
+        WHERE identity_key=?
         ORDER BY id DESC
         LIMIT 1
         """,
-        (name, birth_year, phone_last4),
+        (key,),
     )
     row = cur.fetchone()
 
     if row:
         test_id = row["id"]
-        conn.close()
+        body = load_body(cur, test_id)
+        metrics.inc("writer_test_register_total", result="resumed")
         return jsonify(
             {
                 "ok": True,
@@ -308,79 +2313,496 @@ def api_register():
                 "birthYear": birth_year,
                 "phoneLast4": phone_last4,
                 "title": row["title"],
-                "body": row["body"],
+                "body": body,
                 "charCount": row["char_count"],
                 "status": row["status"],
                 "deadlineAt": row["deadline_at"],
                 "createdAt": row["created_at"],
                 "submittedAt": row["submitted_at"],
+                "rev": row["draft_rev"],
             }
         )
 
-    # 새로 생성: created_at만 의미 있게 사용, deadline_at은 빈 문자열로 저장
-    created_at = now.strftime("%Y-%m-%d %H:%M:%S")
-    deadline_at = ""  # 타이머 사용 안 하므로 표시용만 남김
+    # 새로 생성: created_at만 의미 있게 사용, deadline_at은 빈 문자열로 저장
+    created_at = now.strftime("%Y-%m-%d %H:%M:%S")
+    deadline_at = ""  # 타이머 사용 안 하므로 표시용만 남김
+
+    cur.execute(
+        """
+        INSERT INTO writer_tests (name, birth_year, phone_last4, identity_key, title,
+                                  char_count, status, created_at, deadline_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (name, birth_year, phone_last4, key, "", 0, "pending", created_at, deadline_at),
+    )
+    test_id = cur.lastrowid
+    fts_index(cur, test_id, "", "")
+    conn.commit()
+    metrics.inc("writer_test_register_total", result="new")
+
+    return jsonify(
+        {
+            "ok": True,
+            "testId": test_id,
+            "name": name,
+            "birthYear": birth_year,
+            "phoneLast4": phone_last4,
+            "title": "",
+            "body": "",
+            "charCount": 0,
+            "status": "pending",
+            "deadlineAt": deadline_at,
+            "createdAt": created_at,
+            "submittedAt": None,
+            "rev": 0,
+        }
+    )
+
+# ─────────────────────────
+# 2-1) 응시자: 새로고침 후 저장 상태 다시 받기
+# ─────────────────────────
+@app.route("/api/writer-test/draft", methods=["POST"])
+@write_limited("draft_state")
+def api_draft_state():
+    """
+    새로고침 후 이어쓰기용: 서버에 저장된 제목/본문/rev/상태.
+    - testId 만으로는 남의 본문을 볼 수 없도록 등록 때 쓴 이름/연도/뒷자리가 맞아야 함
+    - 없거나 맞지 않으면 404 (삭제된 것으로 처리)
+    - rev 는 다음 부분 저장의 baseRev
+    """
+    data = request.get_json(force=True)
+    test_id = parse_test_id(data.get("testId"))
+    name = str(data.get("name") or "").strip()
+    birth_year = str(data.get("birthYear") or "").strip()
+    phone_last4 = str(data.get("phoneLast4") or "").strip()
+
+    if not test_id:
+        return jsonify({"ok": False, "reason": "no_test_id"}), 400
+    if not (name and birth_year and phone_last4):
+        return jsonify({"ok": False, "reason": "invalid_input"}), 400
+
+    conn = get_read_db()
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT w.title, b.body, w.status, w.submitted_at, w.deadline_at, w.draft_rev
+        FROM writer_tests w
+        LEFT JOIN writer_test_bodies b ON b.test_id = w.id
+        WHERE w.id=? AND w.identity_key=?
+        """,
+        (test_id, identity_key(name, birth_year, phone_last4)),
+    )
+    row = cur.fetchone()
+    if not row:
+        return jsonify({"ok": False, "reason": "not_found"}), 404
+
+    return jsonify(
+        {
+            "ok": True,
+            "testId": test_id,
+            "title": row["title"],
+            "body": unpack_body(row["body"]),
+            "status": row["status"],
+            "submittedAt": row["submitted_at"],
+            "deadlineAt": row["deadline_at"],
+            "rev": row["draft_rev"],
+        }
+    )
+
+
+# ─────────────────────────
+# 3) 응시자: 중간 저장 (임시저장)
+# ─────────────────────────
+MAX_DRAFT_EDITS = 500  # 부분 저장 한 번에 허용하는 편집 구간 수
+
+
+def non_ws_length(body):
+    # 공백 제외 글자 수
+    return len((body or "").replace(" ", "").replace("\n", "").replace("\t", ""))
+
+
+def apply_text_edits(text, edits):
+    """
+    부분 저장 편집 목록을 text 에 적용한 결과를 반환.
+    - edits: [{"start": int, "end": int, "text": str}, ...]
+      start/end 는 저장된 본문(baseRev) 기준 위치이며, 브라우저 JS 문자열과 같은
+      UTF-16 코드 단위로 센다. 구간끼리 겹치면 안 된다.
+    - 범위가 잘못되었거나 서로게이트 쌍이 잘리면 ValueError
+    """
+    units = (text or "").encode("utf-16-le")
+    total = len(units) // 2
+
+    spans = []
+    for e in edits:
+        start = int(e["start"])
+        end = int(e["end"])
+        new_text = e.get("text") or ""
+        if not isinstance(new_text, str):
+            raise ValueError("edit text")
+        spans.append((start, end, new_text))
+    spans.sort(key=lambda sp: sp[0])
+
+    prev_end = 0
+    for start, end, _ in spans:
+        if start < prev_end or end < start or end > total:
+            raise ValueError("edit range")
+        prev_end = end
+
+    parts = []
+    pos = 0
+    for start, end, new_text in spans:
+        parts.append(units[pos * 2:start * 2])
+        parts.append(new_text.encode("utf-16-le"))
+        pos = end
+    parts.append(units[pos * 2:])
+    # strict 디코딩: 서로게이트 쌍 중간을 자르는 편집은 여기서 걸러짐
+    return b"".join(parts).decode("utf-16-le")
+
+
+# ─────────────────────────
+# 3-2) 임시저장 수정 이력 (snapshot + delta)
+# ─────────────────────────
+# - 저장이 커밋될 때마다 본문 상태를 writer_test_revisions 에 남김 (묶음 안 여러 요청은 마지막 상태 1건)
+# - 보통은 직전 이력과 달라진 구간 하나만 delta 로 저장하고,
+#   delta 가 REVISION_SNAPSHOT_EVERY 개 쌓이거나 delta 합이 본문 전체 압축 크기를 넘으면 다시 snapshot
+#   → 어떤 이력이든 snapshot 1개 + delta 최대 REVISION_SNAPSHOT_EVERY 개로 복원
+REVISION_SNAPSHOT_EVERY = int(os.environ.get("REVISION_SNAPSHOT_EVERY", "20"))
+
+
+def common_prefix_len(a, b):
+    # 슬라이스 비교(C 수준)로 이분 탐색 → 긴 본문도 글자 단위 루프 없이
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def text_delta(old, new):
+    """old → new 를 구간 치환 하나 [start, end, text] 로 (공통 앞/뒤 부분 제외)"""
+    start = common_prefix_len(old, new)
+    tail = common_prefix_len(old[start:][::-1], new[start:][::-1])
+    return [start, len(old) - tail, new[start:len(new) - tail]]
+
+
+def apply_text_delta(text, delta):
+    start, end, new_text = delta
+    return text[:start] + new_text + text[end:]
+
+
+def record_revision(cur, test_id, rev, title, body, prev_body, prev_rev, source):
+    """
+    커밋되는 본문 상태를 이력에 추가.
+    - prev_rev: 이번 묶음 전 draft_rev (prev_body 가 그 rev 의 본문)
+    - 마지막 이력이 prev_rev 가 아니면 (이력 기능 이전 본문 등) delta 기준이 없으므로 snapshot
+    """
+    cur.execute(
+        """
+        SELECT rev, chain_len, chain_bytes FROM writer_test_revisions
+        WHERE test_id=? ORDER BY rev DESC LIMIT 1
+        """,
+        (test_id,),
+    )
+    last = cur.fetchone()
+    full, body_len = pack_body(body)
+    kind, data, chain_len, chain_bytes = "snapshot", full, 0, 0
+    if last and last["rev"] == prev_rev and last["chain_len"] < REVISION_SNAPSHOT_EVERY:
+        delta = zlib.compress(
+            json.dumps(text_delta(prev_body, body), ensure_ascii=False).encode("utf-8")
+        )
+        if last["chain_bytes"] + len(delta) < len(full):
+            kind, data = "delta", delta
+            chain_len, chain_bytes = last["chain_len"] + 1, last["chain_bytes"] + len(delta)
+    cur.execute(
+        """
+        INSERT OR REPLACE INTO writer_test_revisions
+            (test_id, rev, kind, data, title, char_count, body_len,
+             chain_len, chain_bytes, source, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            test_id, rev, kind, data, title, non_ws_length(body), body_len,
+            chain_len, chain_bytes, source, datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        ),
+    )
+
+
+def load_revision(cur, test_id, rev):
+    """rev 시점 본문 (가장 가까운 앞 snapshot 부터 delta 를 차례로 적용). 없으면 None"""
+    cur.execute(
+        """
+        SELECT rev, kind, data FROM writer_test_revisions
+        WHERE test_id=? AND rev<=? AND rev >= (
+            SELECT MAX(rev) FROM writer_test_revisions
+            WHERE test_id=? AND rev<=? AND kind='snapshot'
+        )
+        ORDER BY rev
+        """,
+        (test_id, rev, test_id, rev),
+    )
+    rows = cur.fetchall()
+    if not rows or rows[-1]["rev"] != rev:
+        return None
+    text = unpack_body(rows[0]["data"])
+    for r in rows[1:]:
+        text = apply_text_delta(text, json.loads(zlib.decompress(r["data"])))
+    return text
+
+
+# ─────────────────────────
+# 3-1) 임시저장/제출 묶음 쓰기 (group commit)
+# ─────────────────────────
+# - SQLite 는 쓰기가 한 번에 하나뿐이라, 마감 직전 요청마다 커밋(fsync)하면 줄을 서다가
+#   database is locked 가 난다.
+# - 워커 프로세스마다 쓰기 스레드 1개가 큐에 쌓인 저장 요청을 몇 ms 동안 모아
+#   한 트랜잭션으로 기록하고, 커밋이 끝난 뒤에 각 요청에 응답을 돌려준다.
+# - 같은 testId 요청은 도착 순서대로 메모리에서 이어 붙이고(부분 저장 포함)
+#   DB 에는 마지막 상태만 한 번 쓴다.
+# - DRAFT_GROUP_COMMIT_MS=0 이면 묶지 않고 요청 스레드에서 바로 기록
+DRAFT_GROUP_COMMIT_MS = float(os.environ.get("DRAFT_GROUP_COMMIT_MS", "5"))
+DRAFT_GROUP_MAX_BATCH = int(os.environ.get("DRAFT_GROUP_MAX_BATCH", "128"))
+DRAFT_GROUP_ACK_TIMEOUT = DB_BUSY_TIMEOUT_MS / 1000 * 2 + 5
+
+
+def parse_test_id(value):
+    # 묶음 안에서 같은 testId 를 한 행으로 모으기 위해 정수로 통일 ("12" 와 12)
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def apply_draft_ops(cur, ops):
+    """
+    저장 요청(op) 목록을 순서대로 적용하고, testId 별 최종 상태만 DB 에 기록.
+    - op["kind"]: "draft" (임시저장) | "submit" (최종 제출)
+    - 반환: op 순서대로 (응답 dict, HTTP 상태)
+    - 부분 저장의 baseRev 는 같은 묶음 안 앞선 저장까지 반영된 rev 와 비교
+    """
+    states = {}
+    results = []
+    for op in ops:
+        test_id = op["testId"]
+        if test_id not in states:
+            cur.execute("SELECT title, draft_rev FROM writer_tests WHERE id=?", (test_id,))
+            row = cur.fetchone()
+            body = row and load_body(cur, test_id)
+            states[test_id] = row and {
+                "title": row["title"] or "",
+                "body": body,
+                "base_body": body,  # 수정 이력 delta 기준 (base_rev 시점 본문)
+                "rev": row["draft_rev"],
+                "base_rev": row["draft_rev"],
+                "submitted_at": None,
+            }
+        st = states[test_id]
+
+        if op["kind"] == "submit":
+            if st is None:
+                # 임시저장과 같은 응답: 저장되지 않았는데 ok 로 답하면 응시자는 제출된 줄 앎
+                results.append(({"ok": False, "reason": "not_found"}, 404))
+                continue
+            st["rev"] += 1
+            st.update(title=op["title"], body=op["body"], submitted_at=op["submittedAt"])
+            results.append(({"ok": True, "submittedAt": op["submittedAt"],
+                             "charCount": non_ws_length(op["body"]), "rev": st["rev"]}, 200))
+            continue
+
+        if st is None:
+            results.append(({"ok": False, "reason": "not_found"}, 404))
+            continue
+
+        edits = op.get("edits")
+        if edits is None:
+            body = op.get("body") or ""
+        else:
+            if op.get("baseRev") != st["rev"]:
+                results.append(({"ok": False, "reason": "conflict", "rev": st["rev"]}, 409))
+                continue
+            try:
+                body = apply_text_edits(st["body"], edits)
+            except (KeyError, TypeError, ValueError):
+                results.append(({"ok": False, "reason": "mismatch", "rev": st["rev"]}, 409))
+                continue
+            if len(body.encode("utf-16-le")) // 2 != op.get("bodyLength"):
+                results.append(({"ok": False, "reason": "mismatch", "rev": st["rev"]}, 409))
+                continue
+
+        # 바뀐 게 없으면 rev 도 그대로
+        if body != st["body"] or op["title"] != st["title"]:
+            st["rev"] += 1
+            st.update(title=op["title"], body=body)
+        results.append(({"ok": True, "charCount": non_ws_length(body), "rev": st["rev"]}, 200))
+
+    changed = [(test_id, st) for test_id, st in states.items() if st and st["rev"] != st["base_rev"]]
+    fts_forget(cur, [test_id for test_id, _ in changed])
+    cur.executemany(
+        """
+        UPDATE writer_tests
+        SET title=?, char_count=?, draft_rev=?, submitted_at=COALESCE(?, submitted_at)
+        WHERE id=?
+        """,
+        [
+            (st["title"], non_ws_length(st["body"]), st["rev"], st["submitted_at"], test_id)
+            for test_id, st in changed
+        ],
+    )
+    for test_id, st in changed:
+        store_body(cur, test_id, st["body"])
+        fts_index(cur, test_id, st["title"], st["body"])
+        record_revision(
+            cur, test_id, st["rev"], st["title"], st["body"],
+            st["base_body"], st["base_rev"], "submit" if st["submitted_at"] else "draft",
+        )
+        if st["submitted_at"]:
+            # 무거운 후처리는 같은 트랜잭션에 작업으로만 넣고 바로 응답
+            for kind in POST_SUBMIT_JOBS:
+                enqueue_job(cur, kind, {"testId": int(test_id)}, test_id=test_id)
+    return results
+
+
+class DraftGroupWriter:
+    def __init__(self, window_ms, max_batch):
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        # gunicorn 워커마다 한 번 (fork 이후 프로세스 기준)
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._queue = queue.Queue()
+            name = f"draft-writer-{os.getpid()}"
+            threading.Thread(target=self._run, name=name, daemon=True).start()
+
+    def write(self, op):
+        """
+        op 를 묶음 쓰기에 넣고 커밋될 때까지 기다린 뒤 (응답 dict, HTTP 상태) 반환.
+        - 기다리는 시간이 지나면 TimeoutError (나중에 기록될 수는 있음)
+        """
+        if self.window <= 0:
+            with write_transaction() as conn:
+                return apply_draft_ops(conn.cursor(), [op])[0]
+
+        self._ensure_started()
+        op["done"] = threading.Event()
+        self._queue.put(op)
+        if not op["done"].wait(DRAFT_GROUP_ACK_TIMEOUT):
+            raise TimeoutError("draft group commit timeout")
+        if "error" in op:
+            raise op["error"]
+        return op["result"]
+
+    def _collect(self):
+        ops = [self._queue.get()]
+        deadline = time.monotonic() + self.window
+        while len(ops) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                ops.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return ops
+
+    def _commit(self, ops):
+        metrics.observe("writer_test_draft_batch_ops", len(ops), buckets=BATCH_BUCKETS)
+        conn = get_db()
+        with write_transaction(conn):
+            results = apply_draft_ops(conn.cursor(), ops)
+        for op, result in zip(ops, results):
+            op["result"] = result
+
+    def _retry_locked(self, ops, error):
+        # 잠금 오류는 어느 op 의 문제도 아니므로 하나씩 나눠 봐야 잠금만 더 오래 잡힘
+        # → 묶음 전체를 한 번만 다시 시도하고, 또 실패하면 모두 바로 실패 처리 (응답 503)
+        logger.warning("draft group commit locked (%d ops), retrying batch once: %s", len(ops), error)
+        try:
+            self._commit(ops)
+        except Exception as e:
+            logger.error("draft group commit failed again (%d ops): %s", len(ops), e)
+            for op in ops:
+                op["error"] = e
 
-    cur.execute(
-        """
-        INSERT INTO writer_tests (name, birth_year, phone_last4, title, body, char_count,
-                                  status, created_at, deadline_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        (name, birth_year, phone_last4, "", "", 0, "pending", created_at, deadline_at),
-    )
-    test_id = cur.lastrowid
-    conn.commit()
-    conn.close()
+    def _run(self):
+        while True:
+            ops = self._collect()
+            try:
+                self._commit(ops)
+            except Exception as e:
+                if is_lock_error(e):
+                    self._retry_locked(ops, e)
+                else:
+                    # 데이터/제약 오류: 하나씩 다시 시도 → 문제 있는 요청만 실패 처리
+                    logger.exception("draft group commit failed (%d ops), retrying one by one", len(ops))
+                    for op in ops:
+                        try:
+                            self._commit([op])
+                        except Exception as e:
+                            op["error"] = e
+            for op in ops:
+                op["done"].set()
+            if any(op["kind"] == "submit" and "result" in op for op in ops):
+                notify_jobs()
+
+
+draft_writer = DraftGroupWriter(DRAFT_GROUP_COMMIT_MS, DRAFT_GROUP_MAX_BATCH)
 
-    return jsonify(
-        {
-            "ok": True,
-            "testId": test_id,
-            "name": name,
-            "birthYear": birth_year,
-            "phoneLast4": phone_last4,
-            "title": "",
-            "body": "",
-            "charCount": 0,
-            "status": "pending",
-            "deadlineAt": deadline_at,
-            "createdAt": created_at,
-            "submittedAt": None,
-        }
-    )
 
-# ─────────────────────────
-# 3) 응시자: 중간 저장 (임시저장)
-# ─────────────────────────
 @app.route("/api/writer-test/save_draft", methods=["POST"])
+@write_limited("save_draft")
 def api_save_draft():
+    """
+    임시저장.
+    - 전체 저장: {"testId", "title", "body"}
+    - 부분 저장: {"testId", "title", "baseRev", "edits": [...], "bodyLength"}
+      · baseRev 가 서버의 draft_rev 와 다르면 409 (reason=conflict) → 전체 저장으로 재시도
+      · 적용 결과 길이(UTF-16 기준)가 bodyLength 와 다르면 409 (reason=mismatch)
+    - 응답의 rev 를 다음 부분 저장의 baseRev 로 사용
+    - 실제 기록은 draft_writer 가 다른 저장 요청과 묶어서 한 번에 커밋
+    """
     data = request.get_json(force=True)
-    test_id = data.get("testId")
-    title = (data.get("title") or "").strip()
-    body = data.get("body") or ""
+    test_id = parse_test_id(data.get("testId"))
+    edits = data.get("edits")
 
     if not test_id:
         return jsonify({"ok": False, "reason": "no_test_id"}), 400
+    if edits is not None and (not isinstance(edits, list) or len(edits) > MAX_DRAFT_EDITS):
+        return jsonify({"ok": False, "reason": "invalid_input"}), 400
 
-    # 공백 제외 글자 수
-    non_ws_body = (body or "").replace(" ", "").replace("\n", "").replace("\t", "")
-    char_count = len(non_ws_body)
-
-    conn = get_db()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        UPDATE writer_tests
-        SET title=?, body=?, char_count=?
-        WHERE id=?
-        """,
-        (title, body, char_count, test_id),
+    op = {
+        "kind": "draft",
+        "testId": test_id,
+        "title": (data.get("title") or "").strip(),
+        "body": data.get("body"),
+        "edits": edits,
+        "baseRev": data.get("baseRev"),
+        "bodyLength": data.get("bodyLength"),
+    }
+    try:
+        payload, status = draft_writer.write(op)
+    except TimeoutError:
+        return jsonify({"ok": False, "reason": "busy"}), 503
+    except sqlite3.OperationalError as e:
+        if not is_lock_error(e):
+            raise
+        return jsonify({"ok": False, "reason": "busy"}), 503
+    metrics.inc(
+        "writer_test_draft_saves_total",
+        mode="full" if edits is None else "patch",
+        result=payload.get("reason", "ok"),
     )
-    conn.commit()
-    conn.close()
-
-    return jsonify({"ok": True, "charCount": char_count})
+    return jsonify(payload), status
 
 
 # ─────────────────────────
@@ -390,9 +2812,10 @@ MIN_NON_WS_LENGTH = 2000  # 공백 제외 최소 글자 수
 
 
 @app.route("/api/writer-test/submit", methods=["POST"])
+@write_limited("submit")
 def api_submit():
     data = request.get_json(force=True)
-    test_id = data.get("testId")
+    test_id = parse_test_id(data.get("testId"))
     title = (data.get("title") or "").strip()
     body = data.get("body") or ""
 
@@ -400,10 +2823,10 @@ def api_submit():
         return jsonify({"ok": False, "reason": "no_test_id"}), 400
 
     # 공백 제외 글자 수
-    non_ws_body = (body or "").replace(" ", "").replace("\n", "").replace("\t", "")
-    char_count = len(non_ws_body)
+    char_count = non_ws_length(body)
 
     if char_count < MIN_NON_WS_LENGTH:
+        metrics.inc("writer_test_submit_total", result="too_short")
         return jsonify(
             {
                 "ok": False,
@@ -414,26 +2837,28 @@ def api_submit():
         ), 400
 
     # 현재 시각 (타이머와 무관, 단순 제출 시각 기록용)
-    now = datetime.now()
-
-    conn = get_db()
-    cur = conn.cursor()
-
     # deadline_at은 더 이상 비교하지 않으므로 조회/검사 생략
-    submitted_at = now.strftime("%Y-%m-%d %H:%M:%S")
-
-    cur.execute(
-        """
-        UPDATE writer_tests
-        SET title=?, body=?, char_count=?, submitted_at=?
-        WHERE id=?
-        """,
-        (title, body, char_count, submitted_at, test_id),
-    )
-    conn.commit()
-    conn.close()
+    submitted_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    return jsonify({"ok": True, "submittedAt": submitted_at, "charCount": char_count})
+    op = {
+        "kind": "submit",
+        "testId": test_id,
+        "title": title,
+        "body": body,
+        "submittedAt": submitted_at,
+    }
+    try:
+        payload, status = draft_writer.write(op)
+    except TimeoutError:
+        return jsonify({"ok": False, "reason": "busy"}), 503
+    except sqlite3.OperationalError as e:
+        if not is_lock_error(e):
+            raise
+        return jsonify({"ok": False, "reason": "busy"}), 503
+    if draft_writer.window <= 0:
+        notify_jobs()
+    metrics.inc("writer_test_submit_total", result=payload.get("reason", "ok"))
+    return jsonify(payload), status
 
 
 # ─────────────────────────
@@ -445,8 +2870,21 @@ def api_result():
     if not test_id:
         return jsonify({"ok": False, "reason": "no_test_id"}), 400
 
-    conn = get_db()
+    conn = get_read_db()
     cur = conn.cursor()
+    # 결과 화면은 대기 중 반복 새로고침 → change_rev 만 먼저 보고 그대로면 304
+    cur.execute("SELECT change_rev FROM writer_tests WHERE id=?", (test_id,))
+    rev_row = cur.fetchone()
+    if not rev_row:
+        return jsonify({"ok": False, "reason": "not_found"}), 404
+
+    return conditional_response(
+        f"result-{test_id}-{rev_row['change_rev']}",
+        lambda: build_result(cur, test_id),
+    )
+
+
+def build_result(cur, test_id):
     cur.execute(
         """
         SELECT id, name, birth_year, phone_last4, title, char_count,
@@ -457,7 +2895,6 @@ def api_result():
         (test_id,),
     )
     row = cur.fetchone()
-    conn.close()
 
     if not row:
         return jsonify({"ok": False, "reason": "not_found"}), 404
@@ -482,85 +2919,748 @@ def api_result():
 # ─────────────────────────
 # 6) 관리자: 지원자 목록
 # ─────────────────────────
+VALID_STATUSES = ("pending", "pass", "fail", "return")
+
+LIST_DEFAULT_LIMIT = 50
+LIST_MAX_LIMIT = 200
+
+# 정렬 키 → (정렬 컬럼, 내림차순 여부). 커서는 (정렬 컬럼 값, id) 기준 keyset
+LIST_SORTS = {
+    "newest": (None, True),
+    "oldest": (None, False),
+    "length_desc": ("char_count", True),
+    "length_asc": ("char_count", False),
+}
+
+
+def build_test_filters(args):
+    """
+    목록/집계 공용 필터 → (WHERE 절, 파라미터).
+    - status: pending|pass|fail|return (콤마로 여러 개 가능)
+    - from / to: YYYY-MM-DD (dateField=created|submitted 기준, 기본 created)
+    - minLength: 공백 제외 글자 수 하한
+    잘못된 값이면 ValueError.
+    """
+    where = []
+    params = []
+
+    status = (args.get("status") or "").strip()
+    if status:
+        statuses = [st for st in status.split(",") if st]
+        if any(st not in VALID_STATUSES for st in statuses):
+            raise ValueError("status")
+        where.append("status IN (%s)" % ",".join("?" * len(statuses)))
+        params.extend(statuses)
+
+    date_field = {"created": "created_at", "submitted": "submitted_at"}.get(
+        args.get("dateField") or "created"
+    )
+    if date_field is None:
+        raise ValueError("dateField")
+
+    date_from = (args.get("from") or "").strip()
+    if date_from:
+        datetime.strptime(date_from, "%Y-%m-%d")
+        where.append(f"{date_field} >= ?")
+        params.append(date_from)
+
+    date_to = (args.get("to") or "").strip()
+    if date_to:
+        # to 는 해당 날짜 하루 전체를 포함
+        next_day = datetime.strptime(date_to, "%Y-%m-%d") + timedelta(days=1)
+        where.append(f"{date_field} < ?")
+        params.append(next_day.strftime("%Y-%m-%d"))
+
+    min_length = args.get("minLength")
+    if min_length not in (None, ""):
+        where.append("char_count >= ?")
+        params.append(int(min_length))
+
+    return where, params
+
+
+def current_change_rev(cur):
+    cur.execute("SELECT value FROM change_seq WHERE name='writer_tests'")
+    row = cur.fetchone()
+    return row["value"] if row else 0
+
+
+# 목록 응답 형식 (?format=)
+# - rows (기본): [{"id": …, "name": …}, …] → 행마다 키 이름이 반복됨
+# - columnar: {"columns": [...], "values": [[id…], [name…], …]}
+#   · 열 이름은 한 번만, 값은 열별 배열. 커서 튜플을 그대로 전치해서 행별 dict 를 만들지 않음
+#   · SELECT 컬럼 순서 = *_COLUMNS 순서여야 함
+LIST_FORMATS = ("rows", "columnar")
+
+TEST_LIST_COLUMNS = (
+    "id", "name", "birthYear", "phoneLast4", "title", "length",
+    "status", "createdAt", "submittedAt", "deadlineAt",
+)
+TEST_LIST_SELECT = """
+    SELECT id, name, birth_year, phone_last4, title, char_count,
+           status, created_at, submitted_at, deadline_at
+"""
+
+
+def list_format():
+    """?format= 값 (잘못된 값이면 ValueError)"""
+    fmt = request.args.get("format") or "rows"
+    if fmt not in LIST_FORMATS:
+        raise ValueError(fmt)
+    return fmt
+
+
+def columnar(columns, rows):
+    values = list(zip(*rows)) if rows else [() for _ in columns]
+    return {"columns": columns, "values": values}
+
+
+def test_list_item(r):
+    return {
+        "id": r["id"],
+        "name": r["name"],
+        "birthYear": r["birth_year"],
+        "phoneLast4": r["phone_last4"],
+        "title": r["title"],
+        "length": r["char_count"],
+        "status": r["status"],
+        "createdAt": r["created_at"],
+        "submittedAt": r["submitted_at"],
+        "deadlineAt": r["deadline_at"],
+    }
+
+
 @app.route("/api/writer-test/list", methods=["GET"])
 @require_admin
 def api_list():
-    conn = get_db()
+    """
+    지원자 목록 (한 페이지씩).
+    - limit: 한 번에 가져올 개수 (기본 50, 최대 200)
+    - sort: newest | oldest | length_desc | length_asc
+    - cursor: 이전 응답의 nextCursor (없으면 첫 페이지)
+    - 필터: build_test_filters 참고
+    """
+    sort = request.args.get("sort") or "newest"
+    if sort not in LIST_SORTS:
+        return jsonify({"ok": False, "reason": "invalid_input"}), 400
+    sort_col, desc = LIST_SORTS[sort]
+    op = "<" if desc else ">"
+    direction = "DESC" if desc else "ASC"
+
+    try:
+        fmt = list_format()
+        limit = min(max(request.args.get("limit", LIST_DEFAULT_LIMIT, type=int), 1), LIST_MAX_LIMIT)
+        where, params = build_test_filters(request.args)
+
+        cursor = request.args.get("cursor") or ""
+        if cursor:
+            if sort_col:
+                cursor_value, cursor_id = (int(v) for v in cursor.split(":", 1))
+                where.append(f"({sort_col} {op} ? OR ({sort_col} = ? AND id {op} ?))")
+                params.extend([cursor_value, cursor_value, cursor_id])
+            else:
+                where.append(f"id {op} ?")
+                params.append(int(cursor))
+    except ValueError:
+        return jsonify({"ok": False, "reason": "invalid_input"}), 400
+
+    order_by = f"{sort_col} {direction}, id {direction}" if sort_col else f"id {direction}"
+    where_sql = ("WHERE " + " AND ".join(where)) if where else ""
+
+    conn = get_read_db()
+    cur = conn.cursor()
+    # 목록보다 먼저 읽어 둔 변경 번호 → 이후 /changes?since=rev 로 빠짐없이 이어받음
+    # (같은 번호 + 같은 쿼리스트링이면 결과도 같으므로 ETag 로 사용)
+    rev = current_change_rev(cur)
+
+    def build():
+        cur.execute(
+            f"""
+            {TEST_LIST_SELECT}
+            FROM writer_tests
+            {where_sql}
+            ORDER BY {order_by}
+            LIMIT ?
+            """,
+            params + [limit + 1],
+        )
+        rows = cur.fetchall()
+
+        # limit+1 개를 읽어서 다음 페이지 존재 여부 판단
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = f"{last[sort_col]}:{last['id']}" if sort_col else str(last["id"])
+
+        if fmt == "columnar":
+            tests = columnar(TEST_LIST_COLUMNS, rows)
+        else:
+            tests = [test_list_item(r) for r in rows]
+        return jsonify({"tests": tests, "nextCursor": next_cursor, "rev": rev})
+
+    return conditional_response(query_etag("list", rev), build)
+
+
+# ─────────────────────────
+# 6) 관리자: 상태별 건수 (목록 필터와 동일 조건, status 제외)
+# ─────────────────────────
+@app.route("/api/writer-test/counts", methods=["GET"])
+@require_admin
+def api_counts():
+    args = request.args.to_dict()
+    args.pop("status", None)
+    try:
+        where, params = build_test_filters(args)
+    except ValueError:
+        return jsonify({"ok": False, "reason": "invalid_input"}), 400
+    where_sql = ("WHERE " + " AND ".join(where)) if where else ""
+
+    conn = get_read_db()
+    cur = conn.cursor()
+    cur.execute(
+        f"SELECT status, COUNT(*) AS cnt FROM writer_tests {where_sql} GROUP BY status",
+        params,
+    )
+    counts = {st: 0 for st in VALID_STATUSES}
+    total = 0
+    for r in cur:
+        counts[r["status"]] = counts.get(r["status"], 0) + r["cnt"]
+        total += r["cnt"]
+    return jsonify({"ok": True, "total": total, "counts": counts})
+
+
+# ─────────────────────────
+# 6) 관리자: 대시보드 집계 (트리거로 유지되는 writer_test_stats)
+# ─────────────────────────
+STATS_DEFAULT_HOURS = 48
+STATS_MAX_HOURS = 24 * 31
+
+
+@app.route("/api/writer-test/stats", methods=["GET"])
+@require_admin
+def api_stats():
+    """
+    전체 집계 (필터 없음, 테이블 크기와 상관없이 집계 행만 읽음).
+    - counts: 상태별 건수, submitted / drafts: 제출 / 미제출 건수
+    - lengthBuckets: 제출된 TEST 글자수 구간별 건수
+    - hourly: 최근 hours 시간(기본 48) 동안 시간대별 제출 건수 (0건인 시간은 생략)
+    """
+    hours = request.args.get("hours", STATS_DEFAULT_HOURS, type=int)
+    hours = min(max(hours, 1), STATS_MAX_HOURS)
+
+    cur = get_read_db().cursor()
+    rev = current_change_rev(cur)
+
+    def build():
+        since = (datetime.now() - timedelta(hours=hours - 1)).strftime("%Y-%m-%d %H")
+        cur.execute(
+            """
+            SELECT metric, key, value FROM writer_test_stats
+            WHERE metric != 'hour' OR key >= ?
+            """,
+            (since,),
+        )
+        counts = {st: 0 for st in VALID_STATUSES}
+        phases = {"submitted": 0, "draft": 0}
+        lengths = {}
+        hourly = []
+        for r in cur.fetchall():
+            if r["value"] <= 0:
+                continue
+            if r["metric"] == "status":
+                counts[r["key"]] = r["value"]
+            elif r["metric"] == "phase":
+                phases[r["key"]] = r["value"]
+            elif r["metric"] == "length":
+                lengths[int(r["key"])] = r["value"]
+            elif r["metric"] == "hour":
+                hourly.append({"hour": r["key"], "count": r["value"]})
+
+        last = STATS_LENGTH_BUCKETS * STATS_LENGTH_BUCKET
+        buckets = [
+            {
+                "from": start,
+                "to": start + STATS_LENGTH_BUCKET - 1 if start < last else None,
+                "count": lengths.get(start, 0),
+            }
+            for start in range(0, last + 1, STATS_LENGTH_BUCKET)
+        ]
+        return jsonify(
+            {
+                "ok": True,
+                "total": sum(counts.values()),
+                "counts": counts,
+                "submitted": phases["submitted"],
+                "drafts": phases["draft"],
+                "lengthBuckets": buckets,
+                "hourly": sorted(hourly, key=lambda h: h["hour"]),
+                "rev": rev,
+            }
+        )
+
+    # 시간대 목록은 현재 시각에 따라 달라지므로 시(hour)도 ETag 에 포함
+    return conditional_response(
+        query_etag("stats", rev, datetime.now().strftime("%Y%m%d%H")), build
+    )
+
+
+# ─────────────────────────
+# 6-1) 관리자: 개별 TEST 본문 보기
+# ─────────────────────────
+@app.route("/api/writer-test/get", methods=["GET"])
+@require_admin
+def api_get_test():
+    """
+    관리자/응시자 공용: testId(또는 id)로 본문 포함 상세 조회
+    """
+    test_id = request.args.get("id", type=int) or request.args.get("testId", type=int)
+    if not test_id:
+        return jsonify({"ok": False, "error": "no_id"}), 400
+
+    conn = get_read_db()
+    cur = conn.cursor()
+    # 본문 저장은 항상 draft_rev 를 올리므로 change_rev 만으로 본문 변경까지 판단 가능
+    cur.execute("SELECT change_rev FROM writer_tests WHERE id=?", (test_id,))
+    rev_row = cur.fetchone()
+    if not rev_row:
+        return jsonify({"ok": False, "error": "not_found"}), 404
+
+    return conditional_response(
+        f"test-{test_id}-{rev_row['change_rev']}",
+        lambda: build_test_detail(cur, test_id),
+    )
+
+
+def build_test_detail(cur, test_id):
+    cur.execute(
+        """
+        SELECT w.id, w.name, w.birth_year, w.phone_last4, w.title, b.body, w.char_count,
+               w.status, w.created_at, w.submitted_at, w.deadline_at, w.draft_rev
+        FROM writer_tests w
+        LEFT JOIN writer_test_bodies b ON b.test_id = w.id
+        WHERE w.id=?
+        """,
+        (test_id,),
+    )
+    row = cur.fetchone()
+
+    if not row:
+        return jsonify({"ok": False, "error": "not_found"}), 404
+
+    test = {
+        "id": row["id"],
+        "name": row["name"],
+        "birthYear": row["birth_year"],
+        "phoneLast4": row["phone_last4"],
+        "title": row["title"],
+        "content": unpack_body(row["body"]),  # 관리자 페이지 viewer에서 content로 사용
+        "charCount": row["char_count"],
+        "status": row["status"],
+        "createdAt": row["created_at"],
+        "submittedAt": row["submitted_at"],
+        "deadlineAt": row["deadline_at"],
+        "rev": row["draft_rev"],
+    }
+    return jsonify({"ok": True, "test": test})
+
+
+# ─────────────────────────
+# 6-2) 관리자: 비슷한 제출 찾기 (보관된 이전 회차 포함)
+# ─────────────────────────
+@app.route("/api/writer-test/similar", methods=["GET"])
+@require_admin
+def api_similar():
+    test_id = request.args.get("id", type=int) or request.args.get("testId", type=int)
+    if not test_id:
+        return jsonify({"ok": False, "reason": "no_id"}), 400
+    limit = min(max(request.args.get("limit", 5, type=int), 1), 50)
+    min_score = request.args.get("minScore", 0.3, type=float)
+
+    conn = get_read_db()
+    cur = conn.cursor()
+    matches = find_similar_tests(cur, test_id, limit=limit, min_score=min_score)
+
+    # 지원자 정보: 현재 목록 → 마감된 회차 → 예전 보관 테이블
+    similar = []
+    for other_id, score in matches:
+        cur.execute(
+            "SELECT id, name, title, status, submitted_at, NULL AS archived_at "
+            "FROM writer_tests WHERE id=?",
+            (other_id,),
+        )
+        row = cur.fetchone()
+        round_name = None
+        if row is None:
+            round_name, row = find_round_test(cur, other_id)
+        if row is None:
+            cur.execute(
+                "SELECT id, name, title, status, submitted_at, archived_at "
+                "FROM writer_tests_archive WHERE id=? ORDER BY archived_at DESC LIMIT 1",
+                (other_id,),
+            )
+            row = cur.fetchone()
+        similar.append(
+            {
+                "id": other_id,
+                "score": round(score, 3),
+                "name": row["name"] if row else None,
+                "title": row["title"] if row else None,
+                "status": row["status"] if row else None,
+                "submittedAt": row["submitted_at"] if row else None,
+                "archivedAt": row["archived_at"] if row and not round_name else None,
+                "round": round_name,
+            }
+        )
+    return jsonify({"ok": True, "testId": test_id, "similar": similar})
+
+
+# ─────────────────────────
+# 6-3) 관리자: 제목/본문 검색
+# ─────────────────────────
+SEARCH_MAX_LIMIT = 50
+# snippet 강조 표시 (HTML 태그 대신 제어 문자 → 화면에서 이스케이프 후 <mark> 로 바꿈)
+SEARCH_MARK_START = "\x02"
+SEARCH_MARK_END = "\x03"
+
+
+def build_search_query(q):
+    """
+    검색어 → (FTS MATCH 식 또는 None, 짧은 검색어 목록).
+    - 공백으로 나눈 단어를 모두 포함(AND)하는 행을 찾음
+    - trigram 은 3글자 이상만 색인을 쓰므로 1~2글자 단어는 instr() 로 따로 확인
+    """
+    terms = q.split()
+    long_terms = [t for t in terms if len(t) >= 3]
+    short_terms = [t for t in terms if len(t) < 3]
+    match = " AND ".join('"' + t.replace('"', '""') + '"' for t in long_terms) or None
+    return match, short_terms
+
+
+@app.route("/api/writer-test/search", methods=["GET"])
+@require_admin
+def api_search():
+    """
+    제목/본문 검색 (관련도 순, 본문 일부 강조 표시)
+    - q: 검색어 (공백으로 여러 단어 → 모두 포함)
+    - limit / offset: 페이지
+    """
+    q = (request.args.get("q") or "").strip()
+    if not q:
+        return jsonify({"ok": False, "reason": "invalid_input"}), 400
+    limit = min(max(request.args.get("limit", 20, type=int), 1), SEARCH_MAX_LIMIT)
+    offset = max(request.args.get("offset", 0, type=int), 0)
+
+    conn = get_read_db()
     cur = conn.cursor()
+    has_fts = cur.execute(
+        "SELECT 1 FROM sqlite_master WHERE name='writer_tests_fts'"
+    ).fetchone() is not None
+    if not has_fts:
+        return jsonify({"ok": False, "reason": "search_unavailable"}), 501
+
+    match, short_terms = build_search_query(q)
+    where = []
+    params = [SEARCH_MARK_START, SEARCH_MARK_END, SEARCH_MARK_START, SEARCH_MARK_END]
+    if match:
+        where.append("writer_tests_fts MATCH ?")
+        params.append(match)
+    for t in short_terms:
+        where.append("(instr(f.title, ?) > 0 OR instr(f.body, ?) > 0)")
+        params.extend([t, t])
+
+    cur.execute(
+        f"""
+        SELECT w.id, w.name, w.birth_year, w.status, w.char_count, w.submitted_at,
+               highlight(writer_tests_fts, 0, ?, ?) AS title_hl,
+               snippet(writer_tests_fts, 1, ?, ?, '…', 24) AS snippet
+        FROM writer_tests_fts f
+        JOIN writer_tests w ON w.id = f.rowid
+        WHERE {" AND ".join(where)}
+        ORDER BY {"rank" if match else "w.id DESC"}
+        LIMIT ? OFFSET ?
+        """,
+        params + [limit + 1, offset],
+    )
+    rows = cur.fetchall()
+
+    results = [
+        {
+            "id": r["id"],
+            "name": r["name"],
+            "birthYear": r["birth_year"],
+            "status": r["status"],
+            "length": r["char_count"],
+            "submittedAt": r["submitted_at"],
+            "title": r["title_hl"],
+            "snippet": r["snippet"],
+        }
+        for r in rows[:limit]
+    ]
+    next_offset = offset + limit if len(rows) > limit else None
+    return jsonify({"ok": True, "results": results, "nextOffset": next_offset})
+
+
+# ─────────────────────────
+# 6-4) 관리자: 변경 내역 (증분 갱신 / SSE)
+# ─────────────────────────
+CHANGES_MAX_LIMIT = 500
+# SSE 스트림은 연결마다 worker 스레드를 붙잡으므로 기본은 끔 (관리자 화면은 /changes?since= 폴링)
+# 켤 때는 gunicorn.conf.py 처럼 gthread worker + 긴 timeout 으로 띄울 것
+CHANGE_STREAM_ENABLED = os.environ.get("CHANGE_STREAM_ENABLED", "0") == "1"
+CHANGE_STREAM_POLL_SECONDS = 1.0
+CHANGE_STREAM_PING_SECONDS = 15
+# 스트림 하나가 worker 를 오래 붙잡지 않도록 주기적으로 끊음 (브라우저 EventSource 가 자동 재접속)
+CHANGE_STREAM_MAX_SECONDS = 300
+
+
+def read_changes(cur, since, limit=CHANGES_MAX_LIMIT):
+    """
+    since 이후 변경 내역.
+    - 반환: {"rev", "upserts", "deletes", "more"}
+      rev 는 다음 호출의 since 로 사용 (more=True 면 이어서 더 받아야 함)
+    """
+    latest = current_change_rev(cur)
+    if since >= latest:
+        return {"rev": latest, "upserts": [], "deletes": [], "more": False}
+
     cur.execute(
         """
         SELECT id, name, birth_year, phone_last4, title, char_count,
-               status, created_at, submitted_at, deadline_at
+               status, created_at, submitted_at, deadline_at, change_rev
         FROM writer_tests
-        ORDER BY id DESC
+        WHERE change_rev > ?
+        ORDER BY change_rev
+        LIMIT ?
+        """,
+        (since, limit + 1),
+    )
+    changes = [(r["change_rev"], "upsert", r) for r in cur.fetchall()]
+    cur.execute(
         """
+        SELECT id, change_rev FROM writer_test_deletions
+        WHERE change_rev > ?
+        ORDER BY change_rev
+        LIMIT ?
+        """,
+        (since, limit + 1),
     )
-    rows = cur.fetchall()
-    conn.close()
+    changes += [(r["change_rev"], "delete", r) for r in cur.fetchall()]
+    changes.sort(key=lambda c: c[0])
+
+    more = len(changes) > limit
+    changes = changes[:limit]
+    rev = changes[-1][0] if more else latest
+
+    upserts = []
+    deletes = []
+    for change_rev, kind, r in changes:
+        if kind == "delete":
+            deletes.append(r["id"])
+        else:
+            item = test_list_item(r)
+            item["rev"] = change_rev
+            upserts.append(item)
+    return {"rev": rev, "upserts": upserts, "deletes": deletes, "more": more}
+
+
+@app.route("/api/writer-test/changes", methods=["GET"])
+@require_admin
+def api_changes():
+    since = request.args.get("since", type=int)
+    if since is None or since < 0:
+        return jsonify({"ok": False, "reason": "invalid_input"}), 400
+    limit = min(max(request.args.get("limit", CHANGES_MAX_LIMIT, type=int), 1), CHANGES_MAX_LIMIT)
+
+    conn = get_read_db()
+    result = read_changes(conn.cursor(), since, limit)
+    result["ok"] = True
+    result["stream"] = CHANGE_STREAM_ENABLED
+    return jsonify(result)
 
-    tests = []
-    for r in rows:
-        tests.append(
-            {
-                "id": r["id"],
-                "name": r["name"],
-                "birthYear": r["birth_year"],
-                "phoneLast4": r["phone_last4"],
-                "title": r["title"],
-                "length": r["char_count"],
-                "status": r["status"],
-                "createdAt": r["created_at"],
-                "submittedAt": r["submitted_at"],
-                "deadlineAt": r["deadline_at"],
-            }
-        )
-    return jsonify({"tests": tests})
+
+@app.route("/api/writer-test/changes/stream", methods=["GET"])
+@require_admin
+def api_changes_stream():
+    """
+    Server-Sent Events: since(또는 Last-Event-ID) 이후 변경이 생길 때마다
+    "changes" 이벤트로 read_changes() 결과를 보냄.
+    ※ 연결 하나가 스레드 하나를 쓰므로 CHANGE_STREAM_ENABLED=1 일 때만 열림
+      (gunicorn 은 gunicorn.conf.py 의 gthread worker 로 띄울 것)
+    """
+    if not CHANGE_STREAM_ENABLED:
+        return jsonify({"ok": False, "reason": "stream_disabled"}), 404
+    since = request.headers.get("Last-Event-ID", type=int)
+    if since is None:
+        since = request.args.get("since", type=int)
+    if since is None or since < 0:
+        return jsonify({"ok": False, "reason": "invalid_input"}), 400
+
+    def generate():
+        # 풀 연결을 오래 붙잡지 않도록 스트림 전용 읽기 연결 사용
+        conn = _open_connection(readonly=True)
+        cursor_rev = since
+        started = last_sent = time.monotonic()
+        try:
+            yield "retry: 3000\n\n"
+            while time.monotonic() - started < CHANGE_STREAM_MAX_SECONDS:
+                result = read_changes(conn.cursor(), cursor_rev)
+                if result["upserts"] or result["deletes"] or result["rev"] != cursor_rev:
+                    cursor_rev = result["rev"]
+                    payload = json.dumps(result, ensure_ascii=False)
+                    yield f"id: {cursor_rev}\nevent: changes\ndata: {payload}\n\n"
+                    last_sent = time.monotonic()
+                    if result["more"]:
+                        continue
+                elif time.monotonic() - last_sent >= CHANGE_STREAM_PING_SECONDS:
+                    yield ": ping\n\n"
+                    last_sent = time.monotonic()
+                time.sleep(CHANGE_STREAM_POLL_SECONDS)
+        finally:
+            conn.close()
+
+    response = Response(stream_with_context(generate()), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
 
 
 # ─────────────────────────
-# 6-1) 관리자: 개별 TEST 본문 보기
+# 6-5) 관리자: 임시저장 수정 이력 (목록 / 본문 / 비교)
 # ─────────────────────────
-@app.route("/api/writer-test/get", methods=["GET"])
+REVISION_DIFF_CONTEXT = 1  # 비교 결과에 함께 보여 줄 앞뒤 줄 수
+
+
+def revision_item(r):
+    return {
+        "rev": r["rev"],
+        "kind": r["kind"],
+        "source": r["source"],
+        "title": r["title"],
+        "charCount": r["char_count"],
+        "bodyLength": r["body_len"],
+        "size": r["size"],
+        "createdAt": r["created_at"],
+    }
+
+
+@app.route("/api/writer-test/revisions", methods=["GET"])
 @require_admin
-def api_get_test():
+def api_revisions():
     """
-    관리자/응시자 공용: testId(또는 id)로 본문 포함 상세 조회
+    TEST 하나의 수정 이력 목록 (오래된 순).
+    - id: TEST id
+    - size: 저장된 압축 크기 (snapshot / delta)
     """
-    test_id = request.args.get("id", type=int) or request.args.get("testId", type=int)
+    test_id = request.args.get("id", type=int)
     if not test_id:
-        return jsonify({"ok": False, "error": "no_id"}), 400
+        return jsonify({"ok": False, "reason": "no_id"}), 400
 
-    conn = get_db()
-    cur = conn.cursor()
+    cur = get_read_db().cursor()
+    cur.execute("SELECT change_rev FROM writer_tests WHERE id=?", (test_id,))
+    rev_row = cur.fetchone()
+    if not rev_row:
+        return jsonify({"ok": False, "reason": "not_found"}), 404
+
+    def build():
+        cur.execute(
+            """
+            SELECT rev, kind, source, title, char_count, body_len,
+                   length(data) AS size, created_at
+            FROM writer_test_revisions
+            WHERE test_id=?
+            ORDER BY rev
+            """,
+            (test_id,),
+        )
+        return jsonify({"ok": True, "revisions": [revision_item(r) for r in cur.fetchall()]})
+
+    return conditional_response(f"revisions-{test_id}-{rev_row['change_rev']}", build)
+
+
+@app.route("/api/writer-test/revisions/get", methods=["GET"])
+@require_admin
+def api_revision_get():
+    """수정 이력 한 건의 본문 (id, rev)"""
+    test_id = request.args.get("id", type=int)
+    rev = request.args.get("rev", type=int)
+    if not test_id or rev is None:
+        return jsonify({"ok": False, "reason": "invalid_input"}), 400
+
+    cur = get_read_db().cursor()
     cur.execute(
         """
-        SELECT id, name, birth_year, phone_last4, title, body, char_count,
-               status, created_at, submitted_at, deadline_at
-        FROM writer_tests
-        WHERE id=?
+        SELECT rev, kind, source, title, char_count, body_len, length(data) AS size, created_at
+        FROM writer_test_revisions WHERE test_id=? AND rev=?
         """,
-        (test_id,),
+        (test_id, rev),
     )
     row = cur.fetchone()
-    conn.close()
+    content = load_revision(cur, test_id, rev) if row else None
+    if content is None:
+        return jsonify({"ok": False, "reason": "not_found"}), 404
+    revision = revision_item(row)
+    revision["content"] = content
+    return jsonify({"ok": True, "revision": revision})
 
-    if not row:
-        return jsonify({"ok": False, "error": "not_found"}), 404
 
-    test = {
-        "id": row["id"],
-        "name": row["name"],
-        "birthYear": row["birth_year"],
-        "phoneLast4": row["phone_last4"],
-        "title": row["title"],
-        "content": row["body"],  # 관리자 페이지 viewer에서 content로 사용
-        "charCount": row["char_count"],
-        "status": row["status"],
-        "createdAt": row["created_at"],
-        "submittedAt": row["submitted_at"],
-        "deadlineAt": row["deadline_at"],
-    }
-    return jsonify({"ok": True, "test": test})
+@app.route("/api/writer-test/revisions/diff", methods=["GET"])
+@require_admin
+def api_revision_diff():
+    """
+    두 수정 이력 비교 (줄 단위 unified diff).
+    - id: TEST id
+    - to: 비교할 이력 (없으면 가장 최근)
+    - from: 기준 이력 (없으면 to 바로 앞 이력, 첫 이력이면 빈 본문)
+    """
+    test_id = request.args.get("id", type=int)
+    if not test_id:
+        return jsonify({"ok": False, "reason": "no_id"}), 400
+    try:
+        to_rev = request.args.get("to")
+        from_rev = request.args.get("from")
+        to_rev = int(to_rev) if to_rev not in (None, "") else None
+        from_rev = int(from_rev) if from_rev not in (None, "") else None
+    except ValueError:
+        return jsonify({"ok": False, "reason": "invalid_input"}), 400
+
+    cur = get_read_db().cursor()
+    if to_rev is None:
+        cur.execute("SELECT MAX(rev) AS rev FROM writer_test_revisions WHERE test_id=?", (test_id,))
+        to_rev = cur.fetchone()["rev"]
+        if to_rev is None:
+            return jsonify({"ok": False, "reason": "not_found"}), 404
+    if from_rev is None:
+        cur.execute(
+            "SELECT MAX(rev) AS rev FROM writer_test_revisions WHERE test_id=? AND rev<?",
+            (test_id, to_rev),
+        )
+        from_rev = cur.fetchone()["rev"]
+
+    new_text = load_revision(cur, test_id, to_rev)
+    old_text = load_revision(cur, test_id, from_rev) if from_rev is not None else ""
+    if new_text is None or old_text is None:
+        return jsonify({"ok": False, "reason": "not_found"}), 404
+
+    lines = list(
+        difflib.unified_diff(
+            old_text.splitlines(),
+            new_text.splitlines(),
+            fromfile=f"rev {from_rev}" if from_rev is not None else "(없음)",
+            tofile=f"rev {to_rev}",
+            n=REVISION_DIFF_CONTEXT,
+            lineterm="",
+        )
+    )
+    return jsonify(
+        {
+            "ok": True,
+            "from": from_rev,
+            "to": to_rev,
+            "diff": lines,
+            "charDelta": non_ws_length(new_text) - non_ws_length(old_text),
+        }
+    )
 
 
 # ─────────────────────────
@@ -569,7 +3669,26 @@ def api_get_test():
 @app.route("/api/writer-test/blacklist", methods=["GET"])
 @require_admin
 def api_blacklist_list():
-    conn = get_db()
+    """
+    블랙리스트 전체 (최근 등록 순).
+    - format: rows | columnar (지원자 목록과 동일)
+    """
+    try:
+        fmt = list_format()
+    except ValueError:
+        return jsonify({"ok": False, "reason": "invalid_input"}), 400
+    # blacklist_add / blacklist_remove 가 올리는 공유 버전이 그대로면 304
+    version = shared_versions.get(VERSION_SLOT_BLACKLIST)
+    return conditional_response(
+        f"blacklist-{version}-{fmt}", lambda: build_blacklist_list(fmt)
+    )
+
+
+BLACKLIST_COLUMNS = ("name", "birthYear", "phoneLast4", "reason", "createdAt")
+
+
+def build_blacklist_list(fmt="rows"):
+    conn = get_read_db()
     cur = conn.cursor()
     cur.execute(
         """
@@ -579,7 +3698,8 @@ def api_blacklist_list():
         """
     )
     rows = cur.fetchall()
-    conn.close()
+    if fmt == "columnar":
+        return jsonify({"blacklist": columnar(BLACKLIST_COLUMNS, rows)})
 
     bl = []
     for r in rows:
@@ -607,8 +3727,7 @@ def api_update_status():
     new_status = data.get("status")
 
     # ★ 여기서 return(반려) 허용
-    valid_statuses = ("pending", "pass", "fail", "return")
-    if not test_id or new_status not in valid_statuses:
+    if not test_id or new_status not in VALID_STATUSES:
         return jsonify({"ok": False, "reason": "invalid_input"}), 400
 
     conn = get_db()
@@ -618,10 +3737,161 @@ def api_update_status():
         (new_status, test_id),
     )
     conn.commit()
-    conn.close()
 
     return jsonify({"ok": True})
 
+# ─────────────────────────
+# 8-2) 관리자: 일괄 처리 (상태 변경 / 삭제 / 블랙리스트)
+# ─────────────────────────
+# - 대상: {"ids": [1, 2, ...]} 또는 {"filter": {목록 필터와 같은 키}}
+# - 한 요청 = 한 트랜잭션(BEGIN IMMEDIATE) + executemany → fsync 1번
+# - 응답의 results 에 id 별 처리 결과 (없는 id 는 ok=false, reason=not_found)
+BULK_MAX_IDS = 5000
+_BULK_CHUNK = 500  # SQLite 바인딩 변수 개수 제한 대비
+
+
+def resolve_bulk_targets(cur, data):
+    """
+    요청 본문 → (요청 id 목록, 실제 있는 행 {id: row}).
+    - filter 는 build_test_filters 와 같은 조건이며, 조건이 하나도 없으면 거부
+      (빈 필터로 전체가 선택되는 실수 방지)
+    잘못된 값이면 ValueError.
+    """
+    columns = "id, name, birth_year, phone_last4"
+    if data.get("filter") is not None:
+        if not isinstance(data["filter"], dict):
+            raise ValueError("filter")
+        where, params = build_test_filters(data["filter"])
+        if not where:
+            raise ValueError("empty_filter")
+        cur.execute(
+            f"SELECT {columns} FROM writer_tests WHERE {' AND '.join(where)} ORDER BY id LIMIT ?",
+            params + [BULK_MAX_IDS + 1],
+        )
+        rows = cur.fetchall()
+        if len(rows) > BULK_MAX_IDS:
+            raise ValueError("too_many")
+        return [r["id"] for r in rows], {r["id"]: r for r in rows}
+
+    ids = data.get("ids")
+    if not isinstance(ids, list) or not ids:
+        raise ValueError("ids")
+    ids = list(dict.fromkeys(int(i) for i in ids))
+    if len(ids) > BULK_MAX_IDS:
+        raise ValueError("too_many")
+
+    found = {}
+    for start in range(0, len(ids), _BULK_CHUNK):
+        chunk = ids[start:start + _BULK_CHUNK]
+        cur.execute(
+            f"SELECT {columns} FROM writer_tests WHERE id IN ({','.join('?' * len(chunk))})",
+            chunk,
+        )
+        found.update((r["id"], r) for r in cur)
+    return ids, found
+
+
+def bulk_results(ids, found, extra=None):
+    """id 별 결과 목록 (extra: {id: 추가 필드})"""
+    results = []
+    for test_id in ids:
+        if test_id not in found:
+            results.append({"id": test_id, "ok": False, "reason": "not_found"})
+        else:
+            results.append(dict({"id": test_id, "ok": True}, **(extra or {}).get(test_id, {})))
+    return results
+
+
+def bulk_invalid(exc):
+    reason = str(exc) if str(exc) in ("empty_filter", "too_many") else "invalid_input"
+    return jsonify({"ok": False, "reason": reason}), 400
+
+
+@app.route("/api/writer-test/bulk_update_status", methods=["POST"])
+@require_admin
+def api_bulk_update_status():
+    data = request.get_json(force=True)
+    new_status = data.get("status")
+    if new_status not in VALID_STATUSES:
+        return jsonify({"ok": False, "reason": "invalid_input"}), 400
+
+    try:
+        with write_transaction() as conn:
+            cur = conn.cursor()
+            ids, found = resolve_bulk_targets(cur, data)
+            cur.executemany(
+                "UPDATE writer_tests SET status=? WHERE id=?",
+                [(new_status, test_id) for test_id in found],
+            )
+    except (ValueError, TypeError) as e:
+        return bulk_invalid(e)
+
+    return jsonify({"ok": True, "updated": len(found), "results": bulk_results(ids, found)})
+
+
+@app.route("/api/writer-test/bulk_delete", methods=["POST"])
+@require_admin
+def api_bulk_delete():
+    data = request.get_json(force=True)
+    try:
+        with write_transaction() as conn:
+            cur = conn.cursor()
+            ids, found = resolve_bulk_targets(cur, data)
+            fts_forget(cur, found)
+            cur.executemany("DELETE FROM writer_tests WHERE id=?", [(i,) for i in found])
+    except (ValueError, TypeError) as e:
+        return bulk_invalid(e)
+
+    return jsonify({"ok": True, "deleted": len(found), "results": bulk_results(ids, found)})
+
+
+@app.route("/api/writer-test/bulk_blacklist", methods=["POST"])
+@require_admin
+def api_bulk_blacklist():
+    """
+    선택한 지원자들을 블랙리스트에 등록.
+    - 이미 등록된 사람(같은 identity_key)은 다시 넣지 않고 alreadyBlacklisted=true
+    """
+    data = request.get_json(force=True)
+    reason = (data.get("reason") or "").strip()
+    today = datetime.now().strftime("%Y-%m-%d")
+
+    extra = {}
+    try:
+        with write_transaction() as conn:
+            cur = conn.cursor()
+            ids, found = resolve_bulk_targets(cur, data)
+            cur.execute("SELECT identity_key FROM blacklist")
+            existing = {r["identity_key"] for r in cur}
+
+            inserts = []
+            for test_id, r in found.items():
+                key = identity_key(r["name"], r["birth_year"], r["phone_last4"])
+                if key in existing:
+                    extra[test_id] = {"alreadyBlacklisted": True}
+                    continue
+                existing.add(key)
+                inserts.append(
+                    (r["name"], r["birth_year"], r["phone_last4"], key, reason, today)
+                )
+            cur.executemany(
+                """
+                INSERT INTO blacklist (name, birth_year, phone_last4, identity_key, reason, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                inserts,
+            )
+    except (ValueError, TypeError) as e:
+        return bulk_invalid(e)
+
+    if inserts:
+        shared_versions.bump(VERSION_SLOT_BLACKLIST)
+
+    return jsonify(
+        {"ok": True, "added": len(inserts), "results": bulk_results(ids, found, extra)}
+    )
+
+
 # ─────────────────────────
 # 8-1) 관리자: 전체 백업 + 초기화 (TEST 종료용)
 # ─────────────────────────
@@ -631,25 +3901,330 @@ def api_export_and_reset():
     """
     [안전 정책]
     - config.test_open 이 '0'(닫힘)일 때만 동작.
-    - 1) writer_tests 전체를 CSV로 만들어 응답(다운로드)
-    - 2) 그 뒤 writer_tests 내용을 전부 삭제(reset)
+    - 1) 현재 회차 마감: writer_tests 전체를 회차 DB(rounds/<이름>.db)로 옮기고 비움
+         (round=이름, 없으면 YYYY-MM)
+    - 2) 방금 마감한 회차를 CSV로 스트리밍 응답(다운로드)
     """
     # TEST가 열린 상태에서는 백업/초기화 금지
     if get_test_open():
         return jsonify({"ok": False, "reason": "test_open"}), 400
 
-    # 1) CSV 백업
-    csv_data = export_writer_tests_csv()
+    round_name = (request.args.get("round") or "").strip() or None
+    if round_name and not ROUND_NAME_RE.match(round_name):
+        return jsonify({"ok": False, "reason": "invalid_input"}), 400
+
+    # 1) 회차 마감 (본 DB 파일은 유지)
+    try:
+        rnd = close_round(round_name)
+    except ValueError as e:
+        return jsonify({"ok": False, "reason": str(e)}), 409
 
-    # 2) 내용 초기화 (DB 파일은 유지)
-    reset_writer_tests()
+    # 2) 브라우저에서 자동 다운로드 되도록 응답 (chunked 전송)
+    return round_csv_response(rnd, "writer_tests_backup.csv")
+
+
+def round_csv_response(rnd, filename):
+    def generate():
+        with open_round_db(rnd["file"]) as rconn:
+            cur = rconn.execute(
+                f"SELECT {', '.join(EXPORT_COLUMNS)} FROM writer_tests ORDER BY id ASC"
+            )
+            yield from iter_csv_rows(cur)
 
-    # 3) 브라우저에서 자동 다운로드 되도록 응답
-    response = make_response(csv_data)
-    response.headers["Content-Disposition"] = "attachment; filename=writer_tests_backup.csv"
+    response = Response(stream_with_context(generate()), mimetype="text/csv")
+    response.headers["Content-Disposition"] = f"attachment; filename={filename}"
     response.headers["Content-Type"] = "text/csv; charset=utf-8"
     return response
 
+
+# ─────────────────────────
+# 8-3) 관리자: 지난 회차 조회 (읽기 전용)
+# ─────────────────────────
+def round_item(r):
+    return {
+        "name": r["name"],
+        "status": r["status"],
+        "rowCount": r["row_count"],
+        "minId": r["min_id"],
+        "maxId": r["max_id"],
+        "startedAt": r["started_at"],
+        "closedAt": r["closed_at"],
+    }
+
+
+def get_closed_round(name):
+    cur = get_read_db().cursor()
+    cur.execute("SELECT * FROM rounds WHERE name=? AND status='closed'", (name,))
+    return cur.fetchone()
+
+
+@app.route("/api/rounds", methods=["GET"])
+@require_admin
+def api_rounds():
+    cur = get_read_db().cursor()
+    cur.execute("SELECT * FROM rounds ORDER BY started_at DESC")
+    return jsonify({"ok": True, "rounds": [round_item(r) for r in cur]})
+
+
+@app.route("/api/rounds/close", methods=["POST"])
+@require_admin
+def api_round_close():
+    """
+    CSV 다운로드 없이 회차만 마감 (TEST 가 닫혀 있을 때만).
+    - {"name": "2026-10"} (없으면 YYYY-MM)
+    """
+    if get_test_open():
+        return jsonify({"ok": False, "reason": "test_open"}), 400
+    data = request.get_json(force=True, silent=True) or {}
+    name = (data.get("name") or "").strip() or None
+    if name and not ROUND_NAME_RE.match(name):
+        return jsonify({"ok": False, "reason": "invalid_input"}), 400
+    try:
+        rnd = close_round(name)
+    except ValueError as e:
+        return jsonify({"ok": False, "reason": str(e)}), 409
+    return jsonify({"ok": True, "round": round_item(rnd)})
+
+
+@app.route("/api/rounds/<name>/list", methods=["GET"])
+@require_admin
+def api_round_list(name):
+    """
+    마감된 회차의 지원자 목록 (id 내림차순, 페이지 단위).
+    - status: 상태 필터 (콤마로 여러 개)
+    - cursor: 이전 응답의 nextCursor
+    - format: rows | columnar (지원자 목록과 동일)
+    """
+    rnd = get_closed_round(name)
+    if rnd is None:
+        return jsonify({"ok": False, "reason": "not_found"}), 404
+
+    where = []
+    params = []
+    try:
+        fmt = list_format()
+        limit = min(max(request.args.get("limit", LIST_DEFAULT_LIMIT, type=int), 1), LIST_MAX_LIMIT)
+        status = (request.args.get("status") or "").strip()
+        if status:
+            statuses = [st for st in status.split(",") if st]
+            if any(st not in VALID_STATUSES for st in statuses):
+                raise ValueError("status")
+            where.append("status IN (%s)" % ",".join("?" * len(statuses)))
+            params.extend(statuses)
+        cursor = request.args.get("cursor") or ""
+        if cursor:
+            where.append("id < ?")
+            params.append(int(cursor))
+    except ValueError:
+        return jsonify({"ok": False, "reason": "invalid_input"}), 400
+    where_sql = ("WHERE " + " AND ".join(where)) if where else ""
+
+    with open_round_db(rnd["file"]) as rconn:
+        rows = rconn.execute(
+            f"""
+            {TEST_LIST_SELECT}
+            FROM writer_tests
+            {where_sql}
+            ORDER BY id DESC
+            LIMIT ?
+            """,
+            params + [limit + 1],
+        ).fetchall()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = str(rows[-1]["id"])
+    return jsonify(
+        {
+            "ok": True,
+            "round": round_item(rnd),
+            "tests": (
+                columnar(TEST_LIST_COLUMNS, rows)
+                if fmt == "columnar"
+                else [test_list_item(r) for r in rows]
+            ),
+            "nextCursor": next_cursor,
+        }
+    )
+
+
+@app.route("/api/rounds/<name>/get", methods=["GET"])
+@require_admin
+def api_round_get(name):
+    rnd = get_closed_round(name)
+    if rnd is None:
+        return jsonify({"ok": False, "reason": "not_found"}), 404
+    test_id = request.args.get("id", type=int)
+    if not test_id:
+        return jsonify({"ok": False, "reason": "no_id"}), 400
+
+    with open_round_db(rnd["file"]) as rconn:
+        row = rconn.execute(
+            f"SELECT {', '.join(ROUND_COLUMNS)} FROM writer_tests WHERE id=?", (test_id,)
+        ).fetchone()
+    if row is None:
+        return jsonify({"ok": False, "reason": "not_found"}), 404
+
+    test = test_list_item(row)
+    test.update(
+        {
+            "charCount": row["char_count"],
+            "content": unpack_body(row["body"]),
+            "rev": row["draft_rev"],
+            "round": name,
+        }
+    )
+    return jsonify({"ok": True, "test": test})
+
+
+@app.route("/api/rounds/<name>/export", methods=["GET"])
+@require_admin
+def api_round_export(name):
+    rnd = get_closed_round(name)
+    if rnd is None:
+        return jsonify({"ok": False, "reason": "not_found"}), 404
+    return round_csv_response(rnd, f"writer_tests_{name}.csv")
+
+
+# ─────────────────────────
+# 8-4) 관리자: 본문 전체 ZIP 내보내기 (지원자마다 TXT 1개)
+# ─────────────────────────
+# - 진행 중인 회차(또는 ?round=이름 의 마감된 회차)의 TEST 를 id 순서로 EXPORT_BATCH_SIZE 건씩 읽어
+#   만들어지는 대로 ZIP 조각을 내보냄 → 행이 많아도 메모리는 한 묶음 분량, 첫 바이트는 바로 전송
+# - 배치마다 짧은 읽기 (id > 마지막 id) 라서 긴 읽기 트랜잭션을 잡지 않음
+# - TXT 내용은 관리자 화면 TXT저장과 같은 "제목 → 빈 줄 → 본문"
+ZIP_STATUS_LABELS = {"pending": "대기", "pass": "합격", "fail": "불합격", "return": "반려"}
+ZIP_UNSAFE_CHARS_RE = re.compile(r'[\\/:*?"<>|\x00-\x1f]')
+
+
+class ZipStreamBuffer:
+    """zipfile 이 쓰는 바이트를 모아 두는 seek 불가 스트림 (generator 가 pop 으로 꺼내 감)"""
+
+    def __init__(self):
+        self._chunks = []
+        self._pos = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._pos
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def zip_entry_name(r):
+    name = ZIP_UNSAFE_CHARS_RE.sub("_", (r["name"] or "").strip()) or "이름없음"
+    status = ZIP_STATUS_LABELS.get(r["status"], r["status"])
+    return f"{r['id']}_{name}_{status}.txt"
+
+
+def iter_zip_rows(fetch_batch):
+    """
+    fetch_batch(last_id) → id 순서 다음 묶음 (없으면 빈 목록) 으로 ZIP 바이트 조각을 생성.
+    - 행: id, name, status, title, body(압축), submitted_at
+    - seek 불가 스트림이라 zipfile 이 항목마다 data descriptor 를 붙임 (중앙 디렉터리는 마지막에)
+    """
+    buf = ZipStreamBuffer()
+    with zipfile.ZipFile(buf, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=6) as zf:
+        last_id = 0
+        while True:
+            rows = fetch_batch(last_id)
+            if not rows:
+                break
+            for r in rows:
+                title = (r["title"] or "").strip()
+                text = (title + "\n\n" if title else "") + unpack_body(r["body"])
+                stamp = r["submitted_at"] or r["created_at"] or ""
+                try:
+                    date_time = datetime.strptime(stamp, "%Y-%m-%d %H:%M:%S").timetuple()[:6]
+                except ValueError:
+                    date_time = datetime.now().timetuple()[:6]
+                info = zipfile.ZipInfo(zip_entry_name(r), date_time=date_time)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                zf.writestr(info, text.encode("utf-8"))
+            last_id = rows[-1]["id"]
+            yield buf.pop()
+    yield buf.pop()
+
+
+@app.route("/api/writer-test/export_zip", methods=["GET"])
+@require_admin
+def api_export_zip():
+    """
+    TEST 본문 전체를 ZIP(TXT 파일 모음)으로 스트리밍 다운로드.
+    - status: 상태 필터 (콤마로 여러 개, 없으면 전체)
+    - round: 마감된 회차 이름 (없으면 진행 중인 회차)
+    - 파일 이름: <id>_<이름>_<상태>.txt
+    """
+    statuses = [st for st in (request.args.get("status") or "").split(",") if st]
+    if any(st not in VALID_STATUSES for st in statuses):
+        return jsonify({"ok": False, "reason": "invalid_input"}), 400
+
+    def status_filter(column):
+        return f"AND {column} IN ({','.join('?' * len(statuses))})" if statuses else ""
+
+    round_name = (request.args.get("round") or "").strip()
+    rnd = None
+    if round_name:
+        rnd = get_closed_round(round_name)
+        if rnd is None:
+            return jsonify({"ok": False, "reason": "not_found"}), 404
+
+    def generate():
+        if rnd is not None:
+            # 마감된 회차: 본문이 writer_tests.body 에 함께 들어 있음
+            with open_round_db(rnd["file"]) as rconn:
+                def fetch_batch(last_id):
+                    return rconn.execute(
+                        f"""
+                        SELECT id, name, status, title, body, created_at, submitted_at
+                        FROM writer_tests
+                        WHERE id > ? {status_filter("status")}
+                        ORDER BY id LIMIT ?
+                        """,
+                        [last_id] + statuses + [EXPORT_BATCH_SIZE],
+                    ).fetchall()
+                yield from iter_zip_rows(fetch_batch)
+            return
+
+        # 풀 연결을 오래 붙잡지 않도록 내보내기 전용 읽기 연결 사용
+        conn = _open_connection(readonly=True)
+        try:
+            def fetch_batch(last_id):
+                return conn.execute(
+                    f"""
+                    SELECT w.id, w.name, w.status, w.title, b.body, w.created_at, w.submitted_at
+                    FROM writer_tests w
+                    LEFT JOIN writer_test_bodies b ON b.test_id = w.id
+                    WHERE w.id > ? {status_filter("w.status")}
+                    ORDER BY w.id LIMIT ?
+                    """,
+                    [last_id] + statuses + [EXPORT_BATCH_SIZE],
+                ).fetchall()
+            yield from iter_zip_rows(fetch_batch)
+        finally:
+            conn.close()
+
+    label = round_name or datetime.now().strftime("%Y%m%d")
+    if statuses:
+        label += "_" + "-".join(statuses)
+    filename = f"writer_tests_{label}.zip"
+    response = Response(stream_with_context(generate()), mimetype="application/zip")
+    response.headers["Content-Disposition"] = f"attachment; filename={filename}"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+
 # ─────────────────────────
 # 9) 관리자: 개별 삭제 / 전체 삭제
 # ─────────────────────────
@@ -661,11 +4236,10 @@ def api_delete():
     if not test_id:
         return jsonify({"ok": False, "reason": "invalid_input"}), 400
 
-    conn = get_db()
-    cur = conn.cursor()
-    cur.execute("DELETE FROM writer_tests WHERE id=?", (test_id,))
-    conn.commit()
-    conn.close()
+    with write_transaction() as conn:
+        cur = conn.cursor()
+        fts_forget(cur, [test_id])
+        cur.execute("DELETE FROM writer_tests WHERE id=?", (test_id,))
 
     return jsonify({"ok": True})
 
@@ -709,7 +4283,6 @@ def api_blacklist_add():
         )
         row = cur.fetchone()
         if not row:
-            conn.close()
             return jsonify({"ok": False, "reason": "not_found"}), 404
 
         name = row["name"]
@@ -727,13 +4300,20 @@ def api_blacklist_add():
     cur = conn.cursor()
     cur.execute(
         """
-        INSERT INTO blacklist (name, birth_year, phone_last4, reason, created_at)
-        VALUES (?, ?, ?, ?, ?)
+        INSERT INTO blacklist (name, birth_year, phone_last4, identity_key, reason, created_at)
+        VALUES (?, ?, ?, ?, ?, ?)
         """,
-        (name, birth_year, phone_last4, reason, datetime.now().strftime("%Y-%m-%d")),
+        (
+            name,
+            birth_year,
+            phone_last4,
+            identity_key(name, birth_year, phone_last4),
+            reason,
+            datetime.now().strftime("%Y-%m-%d"),
+        ),
     )
     conn.commit()
-    conn.close()
+    shared_versions.bump(VERSION_SLOT_BLACKLIST)
 
     return jsonify({"ok": True})
 
@@ -754,21 +4334,90 @@ def api_blacklist_remove():
     cur.execute(
         """
         DELETE FROM blacklist
-        WHERE name=? AND birth_year=? AND phone_last4=?
+        WHERE identity_key=?
         """,
-        (name, birth_year, phone_last4),
+        (identity_key(name, birth_year, phone_last4),),
     )
     conn.commit()
-    conn.close()
+    shared_versions.bump(VERSION_SLOT_BLACKLIST)
 
     return jsonify({"ok": True})
 
 
+# ─────────────────────────
+# 11) 관리자: 백그라운드 작업 상태
+# ─────────────────────────
+def job_item(r):
+    return {
+        "id": r["id"],
+        "kind": r["kind"],
+        "testId": r["test_id"],
+        "status": r["status"],
+        "attempts": r["attempts"],
+        "maxAttempts": r["max_attempts"],
+        "runAfter": r["run_after"],
+        "lastError": r["last_error"],
+        "result": json.loads(r["result"]) if r["result"] else None,
+        "createdAt": r["created_at"],
+        "updatedAt": r["updated_at"],
+    }
+
+
+@app.route("/api/jobs/status", methods=["GET"])
+@require_admin
+def api_jobs_status():
+    """
+    - id=작업ID → 해당 작업 1건
+    - testId=TEST ID → 해당 TEST 의 작업 목록
+    - 둘 다 없으면 상태별 건수
+    """
+    job_id = request.args.get("id", type=int)
+    test_id = request.args.get("testId", type=int)
+
+    conn = get_read_db()
+    cur = conn.cursor()
+
+    if job_id:
+        cur.execute("SELECT * FROM jobs WHERE id=?", (job_id,))
+        row = cur.fetchone()
+        if not row:
+            return jsonify({"ok": False, "reason": "not_found"}), 404
+        return jsonify({"ok": True, "job": job_item(row)})
+
+    if test_id:
+        cur.execute("SELECT * FROM jobs WHERE test_id=? ORDER BY id DESC", (test_id,))
+        return jsonify({"ok": True, "jobs": [job_item(r) for r in cur]})
+
+    cur.execute("SELECT status, COUNT(*) AS cnt FROM jobs GROUP BY status")
+    counts = {st: 0 for st in ("queued", "running", "done", "failed")}
+    for r in cur:
+        counts[r["status"]] = r["cnt"]
+    return jsonify({"ok": True, "counts": counts})
+
+
+# ─────────────────────────
+# 12) 관리자: 운영 지표 (Prometheus 텍스트 형식)
+# ─────────────────────────
+@app.route("/metrics", methods=["GET"])
+@require_admin
+def api_metrics():
+    """
+    모든 gunicorn 워커의 지표 합계.
+    - 다른 워커 값은 최대 METRICS_FLUSH_SECONDS 만큼 늦게 반영될 수 있음
+    """
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+
 # 🔽 Render/gunicorn 환경에서도 앱이 import 될 때 DB 스키마를 반드시 만들어주기
 with app.app_context():
     init_db()
+    FTS_ENABLED = (
+        get_db().execute("SELECT 1 FROM sqlite_master WHERE name='writer_tests_fts'").fetchone()
+        is not None
+    )
 
 
 if __name__ == "__main__":
     # 로컬에서 python server.py 로 실행할 때만 이 부분이 실행됨
+    metrics.clear()
     app.run(host="0.0.0.0", port=5000, debug=True)